@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Calendar Analytics
+Vectorized rollups and a contribution heatmap over daily solve counts
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+
+from streaks import calendar_today
+
+HEATMAP_LEVELS = " ░▒▓█"  # Empty, then quartiles of active-day counts
+WEEKDAY_NAMES = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
+
+
+class CalendarAnalytics:
+    """Daily counts for a date range in a NumPy array indexed by day offset"""
+    
+    def __init__(self, calendar_data, start=None, end=None):
+        ordinals = np.fromiter(
+            (date.fromisoformat(key).toordinal() for key in calendar_data),
+            dtype=np.int64, count=len(calendar_data)
+        )
+        counts = np.fromiter(
+            (day['count'] for day in calendar_data.values()),
+            dtype=np.int64, count=len(calendar_data)
+        )
+        
+        end = end or calendar_today()
+        start = start or end - timedelta(days=364)
+        self.start = start
+        self.end = end
+        
+        first = start.toordinal()
+        self.counts = np.zeros(end.toordinal() - first + 1, dtype=np.int64)
+        in_range = (ordinals >= first) & (ordinals <= end.toordinal())
+        np.add.at(self.counts, ordinals[in_range] - first, counts[in_range])
+        
+        # numpy day numbers (days since 1970-01-01) for every day in range
+        self.days = np.arange(
+            np.datetime64(start.isoformat(), 'D'),
+            np.datetime64((end + timedelta(days=1)).isoformat(), 'D')
+        )
+    
+    @classmethod
+    def for_year(cls, calendar_data, year):
+        """Analytics over one calendar year"""
+        return cls(calendar_data, date(year, 1, 1), date(year, 12, 31))
+    
+    def weekdays(self):
+        """Weekday per day with Sunday = 0"""
+        # 1970-01-01 was a Thursday
+        return (self.days.astype(np.int64) + 4) % 7
+    
+    def weekly_totals(self):
+        """Totals per Sunday-starting week, as (week_start, total) pairs"""
+        padded, first_sunday = self.week_grid()
+        totals = padded.sum(axis=0)
+        return [(first_sunday + timedelta(weeks=i), int(total)) for i, total in enumerate(totals)]
+    
+    def monthly_totals(self):
+        """Totals per month, as ('YYYY-MM', total) pairs"""
+        months = self.days.astype('datetime64[M]')
+        labels, index = np.unique(months, return_inverse=True)
+        totals = np.bincount(index, weights=self.counts, minlength=len(labels))
+        return [(str(label), int(total)) for label, total in zip(labels, totals)]
+    
+    def rolling_mean(self, window):
+        """Trailing mean over `window` days for each day (shorter at the start)"""
+        cumulative = np.concatenate(([0], np.cumsum(self.counts)))
+        index = np.arange(1, len(self.counts) + 1)
+        lower = np.maximum(index - window, 0)
+        return (cumulative[index] - cumulative[lower]) / (index - lower)
+    
+    def weekday_distribution(self):
+        """Total problems per weekday, Sunday first"""
+        return np.bincount(self.weekdays(), weights=self.counts, minlength=7).astype(np.int64)
+    
+    def week_grid(self):
+        """Counts laid out as a 7 x weeks grid (rows Sunday..Saturday)"""
+        lead = int(self.weekdays()[0])
+        trail = (7 - (lead + len(self.counts)) % 7) % 7
+        padded = np.concatenate((
+            np.zeros(lead, dtype=np.int64), self.counts, np.zeros(trail, dtype=np.int64)
+        ))
+        return padded.reshape(-1, 7).T, self.start - timedelta(days=lead)
+    
+    def heatmap_levels(self):
+        """GitHub-style intensity level (0-4) per cell of the week grid"""
+        grid, _ = self.week_grid()
+        active = self.counts[self.counts > 0]
+        if not active.size:
+            return np.zeros_like(grid)
+        
+        thresholds = np.quantile(active, [0.25, 0.5, 0.75])
+        levels = np.digitize(grid, thresholds, right=True) + 1
+        return np.where(grid > 0, levels, 0)
+    
+    def render_heatmap(self):
+        """Render the contribution heatmap as text"""
+        levels = self.heatmap_levels()
+        _, first_sunday = self.week_grid()
+        
+        # Month labels above the first week that starts in each month
+        header = [" "] * levels.shape[1]
+        for week in range(levels.shape[1]):
+            week_start = first_sunday + timedelta(weeks=week)
+            if week_start.day <= 7:
+                label = week_start.strftime('%b')
+                if all(c == " " for c in header[week:week + len(label)]):
+                    header[week:week + len(label)] = label
+        
+        lines = ["    " + "".join(header)[:levels.shape[1]]]
+        symbols = np.array(list(HEATMAP_LEVELS))
+        for weekday, row in enumerate(levels):
+            lines.append(f"{WEEKDAY_NAMES[weekday]} " + "".join(symbols[row]))
+        lines.append(f"    Less {HEATMAP_LEVELS} More")
+        return "\n".join(lines)
+    
+    def summary(self):
+        """Aggregate statistics for the range"""
+        return {
+            'start': self.start.isoformat(),
+            'end': self.end.isoformat(),
+            'total_problems': int(self.counts.sum()),
+            'active_days': int(np.count_nonzero(self.counts)),
+            'best_day': int(self.counts.max()) if self.counts.size else 0,
+            'rolling_7': float(self.rolling_mean(7)[-1]) if self.counts.size else 0.0,
+            'rolling_30': float(self.rolling_mean(30)[-1]) if self.counts.size else 0.0,
+            'weekday_distribution': dict(zip(WEEKDAY_NAMES, self.weekday_distribution().tolist())),
+            'monthly_totals': dict(self.monthly_totals())
+        }
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Calendar Event Log
+Append-only log of calendar marks, folded periodically into the snapshot
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from compact_calendar import COMPACT_FILE, CalendarView, CompactCalendar
+
+BASE_DIR = Path(__file__).parent.parent
+STATS_DIR = BASE_DIR / "stats"
+
+CALENDAR_FILE = STATS_DIR / "calendar.json"
+EVENT_LOG = STATS_DIR / "calendar_events.jsonl"
+LOCK_FILE = STATS_DIR / ".calendar.lock"
+COMPACT_THRESHOLD = 64  # Events in the log before they are folded into the snapshot
+
+
+@contextmanager
+def calendar_lock(exclusive=True):
+    """Hold the calendar lock (shared for readers, exclusive for writers)"""
+    LOCK_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_FILE, 'a+') as lock:
+        if fcntl:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        else:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def read_events():
+    """Read all events in the log"""
+    events = []
+    if EVENT_LOG.exists():
+        with open(EVENT_LOG, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue  # Torn trailing write from a crashed process
+    return events
+
+
+def event_delta(day, event):
+    """Count and new submission ids an event adds to a day
+    
+    Events carrying submission ids only count ids the day has not seen, so
+    replaying the same submissions never double-counts.
+    """
+    ids = event.get('submissions')
+    if ids is None:
+        return event['count'], None
+    
+    seen = set(day.get('submissions', [])) if day else set()
+    new_ids = [submission_id for submission_id in ids if submission_id not in seen]
+    return len(new_ids), new_ids
+
+
+def apply_event(calendar_data, event):
+    """Apply one mark event to calendar.json style data"""
+    day = calendar_data.get(event['date'])
+    count, new_ids = event_delta(day, event)
+    if new_ids is not None and not new_ids:
+        return
+    
+    if day:
+        day['count'] += count
+    else:
+        day = calendar_data[event['date']] = {
+            'count': count,
+            'timestamp': event['timestamp']
+        }
+    if new_ids:
+        day['submissions'] = day.get('submissions', []) + new_ids
+    if event.get('note'):
+        day['note'] = event['note']
+
+
+def load_snapshot():
+    """Load the snapshot from the compact store or calendar.json"""
+    if COMPACT_FILE.exists():
+        # Days are read from the store's bitsets and materialized a year at a time
+        return CalendarView(CompactCalendar())
+    
+    if CALENDAR_FILE.exists():
+        with open(CALENDAR_FILE, 'r') as f:
+            return json.load(f)
+    return {}
+
+
+def load_calendar_data():
+    """Materialize the current calendar: snapshot plus logged events"""
+    with calendar_lock(exclusive=False):
+        calendar_data = load_snapshot()
+        for event in read_events():
+            apply_event(calendar_data, event)
+    return calendar_data
+
+
+def append_event(event):
+    """Append one event to the log; returns the number of logged events"""
+    return append_events([event])
+
+
+def append_events(events):
+    """Append several events with a single locked write; returns the number of logged events"""
+    lines = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+    with calendar_lock():
+        with open(EVENT_LOG, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(read_events())
+
+
+def compact():
+    """Fold logged events into the snapshot and truncate the log"""
+    with calendar_lock():
+        events = read_events()
+        if not events:
+            return 0
+        
+        if COMPACT_FILE.exists():
+            # The compact store is updated in place, day by day; only the sidecars
+            # of the years the events touch are rewritten, once, on close
+            store = CompactCalendar()
+            for event in events:
+                count, new_ids = event_delta(store.get_meta(event['date']), event)
+                if new_ids is not None and not new_ids:
+                    continue
+                
+                if store.add(date.fromisoformat(event['date']), count):
+                    store.set_meta(event['date'], timestamp=event['timestamp'])
+                if new_ids:
+                    submissions = store.get_meta(event['date']).get('submissions', []) + new_ids
+                    store.set_meta(event['date'], submissions=submissions)
+                if event.get('note'):
+                    store.set_meta(event['date'], note=event['note'])
+            store.close()
+        else:
+            calendar_data = load_snapshot()
+            for event in events:
+                apply_event(calendar_data, event)
+            
+            tmp_file = CALENDAR_FILE.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(calendar_data, f, indent=2)
+            tmp_file.replace(CALENDAR_FILE)
+        
+        EVENT_LOG.unlink()
+        return len(events)
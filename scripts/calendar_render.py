@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Calendar Rendering
+Shared ASCII month grids with memoized layouts, for single months or date ranges
+"""
+
+import calendar
+from collections import defaultdict
+from datetime import date, timedelta
+from functools import lru_cache
+
+from compact_calendar import CalendarView, active_dates
+from streaks import calendar_today
+
+WEEK_HEADER = "Sun Mon Tue Wed Thu Fri Sat\n"
+
+
+@lru_cache(maxsize=None)
+def month_layout(year, month):
+    """Week rows of day numbers for a month (0 for padding), computed once"""
+    return tuple(tuple(week) for week in calendar.monthcalendar(year, month))
+
+
+@lru_cache(maxsize=4096)
+def render_month_grid(year, month, active_days):
+    """Render the week rows of a month; active_days is a frozenset of day numbers"""
+    grid = ""
+    for week in month_layout(year, month):
+        week_str = ""
+        for day in week:
+            if day == 0:
+                week_str += "    "
+            elif day in active_days:
+                week_str += " ✅ "
+            else:
+                week_str += f"{day:3d} "
+        grid += week_str + "\n"
+    return grid
+
+
+def group_active_days(calendar_data, start=None, end=None):
+    """Group active dates into {(year, month): frozenset(days)} in one pass"""
+    groups = defaultdict(set)
+    for day in active_dates(calendar_data, start, end):
+        groups[(day.year, day.month)].add(day.day)
+    return {key: frozenset(days) for key, days in groups.items()}
+
+
+def month_grid(calendar_data, year, month):
+    """Render one month's week rows from calendar.json style data"""
+    if isinstance(calendar_data, CalendarView):
+        # Only this year's bitset is read
+        last = date(year, month, calendar.monthrange(year, month)[1])
+        active = frozenset(day.day for day in calendar_data.active_dates(date(year, month, 1), last))
+    else:
+        prefix = f"{year}-{month:02d}-"
+        active = frozenset(int(key[-2:]) for key in calendar_data if key.startswith(prefix))
+    return render_month_grid(year, month, active)
+
+
+def months_between(start, end):
+    """(year, month) pairs covering start..end inclusive"""
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def parse_range(spec, today=None):
+    """Parse a range such as 'last-365', '2025', '2025-03' or '2025-01..2026-06'"""
+    today = today or calendar_today()
+    
+    if spec.startswith("last-"):
+        return today - timedelta(days=int(spec[5:]) - 1), today
+    
+    first, _, last = spec.partition("..")
+    last = last or first
+    return parse_bound(first, start=True), parse_bound(last, start=False)
+
+
+def parse_bound(value, start):
+    """Parse YYYY, YYYY-MM or YYYY-MM-DD as the first or last day it covers"""
+    parts = [int(part) for part in value.split("-")]
+    year = parts[0]
+    month = parts[1] if len(parts) > 1 else (1 if start else 12)
+    if len(parts) > 2:
+        return date(year, month, parts[2])
+    day = 1 if start else calendar.monthrange(year, month)[1]
+    return date(year, month, day)
+
+
+def render_range(calendar_data, start, end, wrap_month):
+    """Render every month touching start..end; wrap_month(year, month, grid) frames each
+
+    Only active days inside the range are marked. Each month is rendered from
+    memoized layouts, and months with the same active days reuse the cached grid.
+    """
+    groups = group_active_days(calendar_data, start, end)
+    output = []
+    for year, month in months_between(start, end):
+        grid = render_month_grid(year, month, groups.get((year, month), frozenset()))
+        output.append(wrap_month(year, month, grid))
+    return "".join(output)
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Compact Calendar Store
+Binary per-year calendar storage: daily counts plus an active-day bitset
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import MutableMapping
+from datetime import date, timedelta
+from pathlib import Path
+
+from content_manifest import write_json_entries
+
+BASE_DIR = Path(__file__).parent.parent
+STATS_DIR = BASE_DIR / "stats"
+
+COMPACT_FILE = STATS_DIR / "calendar.bin"
+# One <year>.json of timestamps and notes per year; an older single calendar_meta.jsonl
+# sidecar is split into it on first use
+META_DIR = STATS_DIR / "calendar_meta"
+
+MAGIC = b"LCAL"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")      # magic, version, number of years
+DAYS_PER_YEAR = 366
+BITSET_BYTES = (DAYS_PER_YEAR + 7) // 8
+YEAR_BLOCK = 2 + DAYS_PER_YEAR * 2 + BITSET_BYTES  # year, counts, bitset
+
+
+class CompactCalendar:
+    """Calendar data in a memory-mapped file of fixed-size year blocks
+
+    Each block holds the year, an array('H') of daily counts indexed by day of
+    year and a bitset of active days. Timestamps, notes and submission ids are
+    sparse and live in one JSON sidecar per year, loaded only for the years
+    that are read and rewritten only for the years that change. Updating a day
+    writes a few bytes in place, so marking costs the same however many years
+    are stored.
+    """
+    
+    def __init__(self, path=COMPACT_FILE, meta_dir=META_DIR):
+        self.path = Path(path)
+        self.meta_dir = Path(meta_dir)
+        self.file = None
+        self.map = None
+        self.years = {}
+        self.meta = {}
+        self.dirty_years = set()
+        self.legacy_meta = None
+        if self.path.exists():
+            self.open()
+    
+    def open(self):
+        """Memory-map the store and index its year blocks"""
+        self.file = open(self.path, 'r+b')
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        
+        magic, version, year_count = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} compact calendar")
+        
+        self.years = {}
+        for i in range(year_count):
+            offset = HEADER.size + i * YEAR_BLOCK
+            (year,) = struct.unpack_from("<H", self.map, offset)
+            self.years[year] = offset
+    
+    def close(self):
+        """Save changed metadata, then flush and unmap the store"""
+        self.save_meta()
+        if self.map is not None:
+            self.map.flush()
+            self.map.close()
+            self.file.close()
+            self.map = self.file = None
+    
+    @staticmethod
+    def create(path, years=()):
+        """Write an empty store with blocks for the given years"""
+        years = sorted(set(years))
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(years)))
+            for year in years:
+                f.write(struct.pack("<H", year))
+                f.write(bytes(YEAR_BLOCK - 2))
+    
+    def add_year(self, year):
+        """Append an empty block for a year"""
+        if self.map is None:
+            self.create(self.path, [year])
+            self.open()
+            return self.years[year]
+        
+        self.close()
+        with open(self.path, 'r+b') as f:
+            f.seek(0, 2)
+            f.write(struct.pack("<H", year))
+            f.write(bytes(YEAR_BLOCK - 2))
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, len(self.years) + 1))
+        self.open()
+        return self.years[year]
+    
+    @staticmethod
+    def locate(day):
+        """Year and zero-based day-of-year for a date"""
+        return day.year, day.timetuple().tm_yday - 1
+    
+    def counts(self, year):
+        """Daily counts for a year as array('H') (zeros for unknown years)"""
+        counts = array('H', bytes(DAYS_PER_YEAR * 2))
+        offset = self.years.get(year)
+        if offset is not None:
+            counts = array('H', self.map[offset + 2:offset + 2 + DAYS_PER_YEAR * 2])
+            if sys.byteorder == 'big':
+                counts.byteswap()  # Stored little-endian
+        return counts
+    
+    def active_bits(self, year):
+        """Active-day bitset for a year as bytes"""
+        offset = self.years.get(year)
+        if offset is None:
+            return bytes(BITSET_BYTES)
+        start = offset + 2 + DAYS_PER_YEAR * 2
+        return bytes(self.map[start:start + BITSET_BYTES])
+    
+    def get(self, day):
+        """Return (active, count) for a date"""
+        year, index = self.locate(day)
+        offset = self.years.get(year)
+        if offset is None:
+            return False, 0
+        
+        (count,) = struct.unpack_from("<H", self.map, offset + 2 + index * 2)
+        bit = self.map[offset + 2 + DAYS_PER_YEAR * 2 + index // 8] >> (index % 8) & 1
+        return bool(bit), count
+    
+    def set(self, day, count):
+        """Mark a date active with the given count, in place"""
+        year, index = self.locate(day)
+        offset = self.years.get(year)
+        if offset is None:
+            offset = self.add_year(year)
+        
+        struct.pack_into("<H", self.map, offset + 2 + index * 2, min(count, 0xFFFF))
+        bit_offset = offset + 2 + DAYS_PER_YEAR * 2 + index // 8
+        self.map[bit_offset] = self.map[bit_offset] | (1 << (index % 8))
+    
+    def add(self, day, count=1):
+        """Increment a date's count, marking it active"""
+        active, current = self.get(day)
+        self.set(day, current + count)
+        return not active
+    
+    @staticmethod
+    def bitset_dates(year, bits):
+        """Active dates of a year's bitset, in order"""
+        start = date(year, 1, 1)
+        for byte_index, byte in enumerate(bits):
+            while byte:
+                low = byte & -byte
+                day = start + timedelta(days=byte_index * 8 + low.bit_length() - 1)
+                byte ^= low
+                if day.year == year:
+                    yield day
+    
+    def active_days(self):
+        """Yield (date, count) for every active day in order"""
+        for year in sorted(self.years):
+            counts = self.counts(year)
+            for day in self.bitset_dates(year, self.active_bits(year)):
+                yield day, counts[self.locate(day)[1]]
+    
+    def meta_path(self, year):
+        """Sidecar file for one year"""
+        return self.meta_dir / f"{year}.json"
+    
+    def year_meta(self, year):
+        """Timestamps and notes for one year's dates, loaded on first use"""
+        if self.legacy_meta is None:
+            self.split_legacy_meta()
+        if year not in self.meta:
+            path = self.meta_path(year)
+            self.meta[year] = {}
+            if path.exists():
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.meta[year] = json.load(f)
+        return self.meta[year]
+    
+    def split_legacy_meta(self):
+        """Load a single calendar_meta.jsonl sidecar into per-year metadata
+        
+        The per-year files replace it the next time the store is saved.
+        """
+        self.legacy_meta = self.meta_dir.with_suffix('.jsonl')
+        if not self.legacy_meta.exists():
+            return
+        
+        with open(self.legacy_meta, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    iso_date = entry.pop('date')
+                    self.year_meta(int(iso_date[:4])).setdefault(iso_date, {}).update(entry)
+                    self.dirty_years.add(int(iso_date[:4]))
+    
+    def get_meta(self, iso_date):
+        """Timestamp/note fields for a date ({} if none)"""
+        return self.year_meta(int(iso_date[:4])).get(iso_date, {})
+    
+    def set_meta(self, iso_date, **fields):
+        """Update timestamp/note fields for a date; written by save_meta or close"""
+        year = int(iso_date[:4])
+        self.year_meta(year).setdefault(iso_date, {}).update(fields)
+        self.dirty_years.add(year)
+    
+    def save_meta(self):
+        """Rewrite the sidecar of every year whose metadata changed"""
+        if not self.dirty_years:
+            return
+        self.meta_dir.mkdir(parents=True, exist_ok=True)
+        for year in sorted(self.dirty_years):
+            write_json_entries(self.meta_path(year), self.meta[year])
+        self.dirty_years.clear()
+        if self.legacy_meta and self.legacy_meta.exists():
+            self.legacy_meta.unlink()
+    
+    def to_dict(self):
+        """Materialize calendar.json style data"""
+        data = {}
+        for day, count in self.active_days():
+            iso_date = day.isoformat()
+            data[iso_date] = {'count': count, **self.get_meta(iso_date)}
+        return data
+    
+    @classmethod
+    def from_dict(cls, calendar_data, path=COMPACT_FILE, meta_dir=META_DIR):
+        """Build a store from calendar.json style data, replacing any existing one"""
+        days = {date.fromisoformat(key): value for key, value in calendar_data.items()}
+        cls.create(path, (day.year for day in days))
+        
+        meta_dir = Path(meta_dir)
+        meta_dir.with_suffix('.jsonl').unlink(missing_ok=True)
+        for old in meta_dir.glob("*.json"):
+            old.unlink()
+        
+        store = cls(path, meta_dir)
+        for day, value in days.items():
+            store.set(day, value.get('count', 0))
+            extra = {k: v for k, v in value.items() if k != 'count'}
+            if extra:
+                store.set_meta(day.isoformat(), **extra)
+        store.save_meta()
+        store.map.flush()
+        return store
+
+
+class CalendarView(MutableMapping):
+    """calendar.json style mapping over a compact store, materialized a year at a time
+
+    Iteration, membership, len() and active_dates() read only the active-day
+    bitsets, copied when the view is created. A year's counts and sidecar are
+    loaded the first time one of its days is read or changed, so rendering a
+    month or computing streaks never touches the rest of the history. Changes
+    stay in memory; marks are persisted through the event log.
+    """
+    
+    def __init__(self, store):
+        self.store = store
+        self.bits = {year: store.active_bits(year) for year in store.years}
+        self.loaded = {}
+    
+    @staticmethod
+    def year_of(iso_date):
+        """Year of an ISO date key, or None if it is not one"""
+        try:
+            return int(iso_date[:4])
+        except (TypeError, ValueError):
+            return None
+    
+    def year_days(self, year):
+        """{iso_date: day} for one year, with counts and metadata"""
+        if year not in self.loaded:
+            days = {}
+            if year in self.bits:
+                counts = self.store.counts(year)
+                meta = self.store.year_meta(year)
+                for day in CompactCalendar.bitset_dates(year, self.bits[year]):
+                    iso_date = day.isoformat()
+                    days[iso_date] = {'count': counts[CompactCalendar.locate(day)[1]], **meta.get(iso_date, {})}
+            self.loaded[year] = days
+        return self.loaded[year]
+    
+    def __getitem__(self, iso_date):
+        year = self.year_of(iso_date)
+        if year is None:
+            raise KeyError(iso_date)
+        return self.year_days(year)[iso_date]
+    
+    def __setitem__(self, iso_date, value):
+        self.year_days(int(iso_date[:4]))[iso_date] = value
+    
+    def __delitem__(self, iso_date):
+        year = self.year_of(iso_date)
+        if year is None:
+            raise KeyError(iso_date)
+        del self.year_days(year)[iso_date]
+    
+    def __contains__(self, iso_date):
+        year = self.year_of(iso_date)
+        if year in self.loaded:
+            return iso_date in self.loaded[year]
+        if year not in self.bits:
+            return False
+        try:
+            index = CompactCalendar.locate(date.fromisoformat(iso_date))[1]
+        except ValueError:
+            return False
+        return bool(self.bits[year][index // 8] >> (index % 8) & 1)
+    
+    def __iter__(self):
+        for day in self.active_dates():
+            yield day.isoformat()
+    
+    def __len__(self):
+        return sum(
+            len(self.loaded[year]) if year in self.loaded else int.from_bytes(bits, 'little').bit_count()
+            for year, bits in self.bits.items()
+        ) + sum(len(days) for year, days in self.loaded.items() if year not in self.bits)
+    
+    def active_dates(self, start=None, end=None):
+        """Active dates within [start, end] (either bound optional), in order"""
+        for year in sorted(set(self.bits) | set(self.loaded)):
+            if (start and year < start.year) or (end and year > end.year):
+                continue
+            if year in self.loaded:
+                days = sorted(date.fromisoformat(key) for key in self.loaded[year])
+            else:
+                days = CompactCalendar.bitset_dates(year, self.bits[year])
+            for day in days:
+                if (not start or day >= start) and (not end or day <= end):
+                    yield day
+
+
+def active_dates(calendar_data, start=None, end=None):
+    """Active dates within [start, end], read from the bitsets for a CalendarView"""
+    if isinstance(calendar_data, CalendarView):
+        return list(calendar_data.active_dates(start, end))
+    days = (date.fromisoformat(key) for key in calendar_data)
+    return [day for day in days if (not start or day >= start) and (not end or day <= end)]
+
+
+def main():
+    """Main entry point"""
+    json_file = STATS_DIR / "calendar.json"
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    
+    if command == "to-compact":
+        with open(json_file, 'r') as f:
+            calendar_data = json.load(f)
+        store = CompactCalendar.from_dict(calendar_data)
+        assert store.to_dict() == calendar_data, "round trip mismatch"
+        store.close()
+        print(f"✅ Wrote {COMPACT_FILE.name} ({len(calendar_data)} active days)")
+    
+    elif command == "to-json":
+        store = CompactCalendar()
+        calendar_data = store.to_dict()
+        store.close()
+        with open(json_file, 'w') as f:
+            json.dump(calendar_data, f, indent=2)
+        print(f"✅ Wrote {json_file.name} ({len(calendar_data)} active days)")
+    
+    else:
+        print("Unknown command. Use: to-compact or to-json")
+
+
+if __name__ == "__main__":
+    main()
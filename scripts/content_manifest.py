@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Content Manifest
+Tracks a hash per generated file so unchanged output is never rewritten
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+STATS_DIR = BASE_DIR / "stats"
+
+MANIFEST_FILE = STATS_DIR / "manifest.json"
+
+
+def write_json_entries(path, mapping):
+    """Atomically write a dict as sorted JSON with one top-level entry per line
+    
+    Each entry is encoded by the C JSON encoder, which is far faster than
+    json.dump(indent=...) on large files while keeping line-per-entry diffs.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    entries = ",\n".join(
+        f"  {json.dumps(key)}: {json.dumps(mapping[key], sort_keys=True, ensure_ascii=False)}"
+        for key in sorted(mapping)
+    )
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write("{\n" + entries + "\n}" if entries else "{}")
+    tmp_path.replace(path)
+
+
+class ContentManifest:
+    """Maps repo-relative paths to the SHA-256 of their last written content
+
+    Counters:
+        written   - content was new or different and the file was (re)written
+        unchanged - content hash matched the manifest, no I/O beyond an exists check
+        skipped   - manifest had no matching hash but the file on disk already
+                    held identical content, so only the manifest was updated
+    """
+    
+    def __init__(self, path=MANIFEST_FILE):
+        self.path = Path(path)
+        self.hashes = self.load()
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.written = 0
+        self.skipped = 0
+        self.unchanged = 0
+    
+    def load(self):
+        """Load the manifest"""
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        return {}
+    
+    def save(self):
+        """Save the manifest if any entry changed"""
+        if not self.dirty:
+            return
+        
+        with self.lock:
+            write_json_entries(self.path, self.hashes)
+            self.dirty = False
+    
+    @staticmethod
+    def digest(content):
+        """Hash text content"""
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    
+    def key(self, filepath):
+        """Manifest key for a path"""
+        filepath = Path(filepath)
+        try:
+            return filepath.resolve().relative_to(BASE_DIR.resolve()).as_posix()
+        except ValueError:
+            return filepath.as_posix()
+    
+    def write(self, filepath, content, make_dirs=True):
+        """Write content to filepath unless it is unchanged
+        
+        The file is replaced atomically via a temp file, and the call is
+        thread-safe so several I/O threads can share one manifest. Returns True
+        if the file was written.
+        """
+        filepath = Path(filepath)
+        key = self.key(filepath)
+        digest = self.digest(content)
+        
+        if self.hashes.get(key) == digest and filepath.exists():
+            with self.lock:
+                self.unchanged += 1
+            return False
+        
+        if filepath.exists():
+            with open(filepath, 'r', encoding='utf-8') as f:
+                if self.digest(f.read()) == digest:
+                    self.record(key, digest, 'skipped')
+                    return False
+        
+        if make_dirs:
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = filepath.with_name(filepath.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        tmp_path.replace(filepath)
+        
+        self.record(key, digest, 'written')
+        return True
+    
+    def record(self, key, digest, counter):
+        """Store a hash and bump a counter under the lock"""
+        with self.lock:
+            self.hashes[key] = digest
+            self.dirty = True
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def write_stream(self, filepath, chunks):
+        """Stream chunks to a temp file and atomically rename it over filepath
+        
+        The content is hashed as it is written; if it matches the manifest or
+        the existing file, the temp file is discarded instead. Returns True if
+        the file was replaced.
+        """
+        filepath = Path(filepath)
+        key = self.key(filepath)
+        tmp_path = filepath.with_name(filepath.name + '.tmp')
+        
+        hasher = hashlib.sha256()
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                hasher.update(chunk.encode('utf-8'))
+                f.write(chunk)
+        digest = hasher.hexdigest()
+        
+        if filepath.exists():
+            if self.hashes.get(key) == digest:
+                tmp_path.unlink()
+                self.unchanged += 1
+                return False
+            
+            if self.file_digest(filepath) == digest:
+                tmp_path.unlink()
+                self.record(key, digest, 'skipped')
+                return False
+        
+        tmp_path.replace(filepath)
+        self.record(key, digest, 'written')
+        return True
+    
+    @staticmethod
+    def file_digest(filepath):
+        """Hash an existing file in blocks"""
+        hasher = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(65536), b''):
+                hasher.update(block)
+        return hasher.hexdigest()
+    
+    def summary(self):
+        """One-line summary of write counters"""
+        return f"{self.written} written, {self.skipped} skipped, {self.unchanged} unchanged"
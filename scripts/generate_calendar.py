@@ -5,10 +5,17 @@ Generates atomic habits style calendar with checkmarks
 """
 
 import json
-from datetime import datetime, timedelta
+from datetime import date, datetime
 from pathlib import Path
 import calendar
 
+from calendar_log import (
+    COMPACT_THRESHOLD, append_event, append_events, apply_event, compact, event_delta,
+    load_calendar_data
+)
+from calendar_render import WEEK_HEADER, month_grid, parse_range, render_range
+from streaks import StreakEngine, calendar_today, local_time
+
 BASE_DIR = Path(__file__).parent.parent
 STATS_DIR = BASE_DIR / "stats"
 
@@ -17,58 +24,82 @@ class CalendarGenerator:
     def __init__(self):
         self.calendar_file = STATS_DIR / "calendar.json"
         self.calendar_data = self.load_calendar()
+        self.streaks = StreakEngine.from_calendar(self.calendar_data)
     
     def load_calendar(self):
-        """Load existing calendar data"""
-        if self.calendar_file.exists():
-            with open(self.calendar_file, 'r') as f:
-                return json.load(f)
-        return {}
+        """Load existing calendar data (snapshot plus logged marks)"""
+        return load_calendar_data()
     
     def save_calendar(self):
         """Save calendar data"""
         with open(self.calendar_file, 'w') as f:
-            json.dump(self.calendar_data, f, indent=2)
+            json.dump(dict(self.calendar_data), f, indent=2)
     
     def mark_today(self, problems_count=1):
         """Mark today as completed"""
-        today = datetime.now().date().isoformat()
+        now = local_time()
+        today = now.date().isoformat()
+        event = {
+            'date': today,
+            'count': problems_count,
+            'timestamp': now.isoformat()
+        }
+        
+        # Append to the event log instead of rewriting the whole history
+        logged = append_event(event)
         
         if today in self.calendar_data:
             self.calendar_data[today]['count'] += problems_count
         else:
             self.calendar_data[today] = {
                 'count': problems_count,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': event['timestamp']
             }
+            self.streaks.add(today)
+        
+        if logged >= COMPACT_THRESHOLD:
+            compact()
         
-        self.save_calendar()
         print(f"✅ Marked {today} with {problems_count} problem(s)")
     
+    def record_events(self, events):
+        """Bulk-merge mark events (e.g. derived from submissions) with one log write"""
+        # Drop events whose submissions are all counted already, so re-runs write nothing
+        events = [event for event in events if event_delta(self.calendar_data.get(event['date']), event)[0]]
+        if not events:
+            return
+        
+        logged = append_events(events)
+        
+        for event in events:
+            before = self.calendar_data.get(event['date'], {}).get('count', 0)
+            apply_event(self.calendar_data, event)
+            if event['date'] in self.calendar_data:
+                self.streaks.add(event['date'])
+                added = self.calendar_data[event['date']]['count'] - before
+                if added:
+                    print(f"✅ Marked {event['date']} with {added} problem(s)")
+        
+        if logged >= COMPACT_THRESHOLD:
+            compact()
+    
+    def format_month(self, year, month, grid):
+        """Frame a rendered month grid with its title and weekday header"""
+        calendar_str = f"\n{calendar.month_name[month]} {year}\n"
+        calendar_str += "=" * 30 + "\n"
+        calendar_str += WEEK_HEADER
+        return calendar_str + grid
+    
     def generate_month_calendar(self, year, month):
         """Generate calendar for specific month"""
-        cal = calendar.monthcalendar(year, month)
-        month_name = calendar.month_name[month]
-        
-        # ASCII calendar
-        calendar_str = f"\n{month_name} {year}\n"
-        calendar_str += "=" * 30 + "\n"
-        calendar_str += "Sun Mon Tue Wed Thu Fri Sat\n"
-        
-        for week in cal:
-            week_str = ""
-            for day in week:
-                if day == 0:
-                    week_str += "    "
-                else:
-                    date_str = f"{year}-{month:02d}-{day:02d}"
-                    if date_str in self.calendar_data:
-                        week_str += f" ✅ "
-                    else:
-                        week_str += f"{day:3d} "
-            calendar_str += week_str + "\n"
-        
-        return calendar_str
+        return self.format_month(year, month, month_grid(self.calendar_data, year, month))
+    
+    def generate_range_calendar(self, start, end):
+        """Generate calendars for every month between two dates"""
+        return render_range(
+            self.calendar_data, start, end,
+            lambda year, month, grid: self.format_month(year, month, grid) + "\n"
+        )
     
     def generate_year_calendar(self, year):
         """Generate full year calendar"""
@@ -76,63 +107,24 @@ class CalendarGenerator:
         year_cal += f"  LeetCode Journey - {year}\n"
         year_cal += f"{'='*50}\n\n"
         
-        for month in range(1, 13):
-            year_cal += self.generate_month_calendar(year, month)
-            year_cal += "\n"
+        year_cal += self.generate_range_calendar(date(year, 1, 1), date(year, 12, 31))
         
         return year_cal
     
     def get_streak(self):
         """Calculate current streak"""
-        if not self.calendar_data:
-            return 0
-        
-        dates = sorted(self.calendar_data.keys(), reverse=True)
-        today = datetime.now().date()
-        streak = 0
-        
-        for date_str in dates:
-            date = datetime.fromisoformat(date_str).date()
-            expected_date = today - timedelta(days=streak)
-            
-            if date == expected_date:
-                streak += 1
-            else:
-                break
-        
-        return streak
+        return self.streaks.current()
     
     def get_stats(self):
         """Get calendar statistics"""
         total_days = len(self.calendar_data)
         total_problems = sum(day['count'] for day in self.calendar_data.values())
-        streak = self.get_streak()
-        
-        # Find longest streak
-        longest_streak = 0
-        current_streak = 0
-        dates = sorted(self.calendar_data.keys())
-        
-        for i, date_str in enumerate(dates):
-            if i == 0:
-                current_streak = 1
-            else:
-                prev_date = datetime.fromisoformat(dates[i-1]).date()
-                curr_date = datetime.fromisoformat(date_str).date()
-                
-                if (curr_date - prev_date).days == 1:
-                    current_streak += 1
-                else:
-                    longest_streak = max(longest_streak, current_streak)
-                    current_streak = 1
-        
-        longest_streak = max(longest_streak, current_streak)
         
         return {
             'total_days': total_days,
             'total_problems': total_problems,
-            'current_streak': streak,
-            'longest_streak': longest_streak,
+            'current_streak': self.streaks.current(),
+            'longest_streak': self.streaks.longest(),
             'average_per_day': total_problems / total_days if total_days > 0 else 0
         }
     
@@ -149,6 +141,40 @@ class CalendarGenerator:
         print(f"  Longest Streak: 🏆 {stats['longest_streak']} days")
         print(f"  Average/Day: {stats['average_per_day']:.1f} problems")
         print("="*50 + "\n")
+    
+    def display_solved(self, start, end):
+        """List the problems solved between two dates, with a difficulty breakdown"""
+        from problem_store import ProblemStore
+        
+        with ProblemStore() as store:
+            problems = store.query(since=start, until=end)
+            by_difficulty = store.counts_by('difficulty', since=start, until=end)
+        
+        print(f"\n✅ Solved {start.isoformat()} → {end.isoformat()}: {len(problems)} problem(s)")
+        print("   " + ", ".join(f"{d.capitalize()} {by_difficulty.get(d, 0)}" for d in ["easy", "medium", "hard"]))
+        for problem in problems:
+            print(f"  {problem['solved_date']}  {problem['difficulty']:<6}  {problem['id']:>5}. {problem['title']}")
+        print()
+    
+    def display_analytics(self, analytics):
+        """Display rollups for an analytics range"""
+        summary = analytics.summary()
+        
+        print("\n" + "="*50)
+        print(f"  📈 ANALYTICS {summary['start']} → {summary['end']}")
+        print("="*50)
+        print(f"  Total Problems: {summary['total_problems']}")
+        print(f"  Active Days: {summary['active_days']}")
+        print(f"  Best Day: {summary['best_day']} problems")
+        print(f"  7-Day Average: {summary['rolling_7']:.2f}/day")
+        print(f"  30-Day Average: {summary['rolling_30']:.2f}/day")
+        print("\n  By Weekday:")
+        for weekday, total in summary['weekday_distribution'].items():
+            print(f"    {weekday}: {total}")
+        print("\n  By Month:")
+        for month, total in summary['monthly_totals'].items():
+            print(f"    {month}: {total}")
+        print("="*50 + "\n")
 
 
 def main():
@@ -165,27 +191,58 @@ def main():
             count = int(sys.argv[2]) if len(sys.argv) > 2 else 1
             generator.mark_today(count)
         
+        elif command == "compact":
+            # Fold logged marks into the calendar snapshot
+            folded = compact()
+            print(f"✅ Compacted {folded} logged mark(s)")
+        
         elif command == "stats":
             # Show statistics
             generator.display_stats()
         
         elif command == "month":
             # Show current month
-            now = datetime.now()
-            print(generator.generate_month_calendar(now.year, now.month))
+            today = calendar_today()
+            print(generator.generate_month_calendar(today.year, today.month))
         
         elif command == "year":
             # Show full year
-            year = int(sys.argv[2]) if len(sys.argv) > 2 else datetime.now().year
+            year = int(sys.argv[2]) if len(sys.argv) > 2 else calendar_today().year
             print(generator.generate_year_calendar(year))
         
+        elif command == "range":
+            # Show every month in a range, e.g. last-365 or 2025-01..2026-06
+            spec = sys.argv[2] if len(sys.argv) > 2 else "last-365"
+            start, end = parse_range(spec)
+            print(generator.generate_range_calendar(start, end))
+        
+        elif command == "solved":
+            # List problems solved in a range (default: this month)
+            spec = sys.argv[2] if len(sys.argv) > 2 else calendar_today().strftime("%Y-%m")
+            start, end = parse_range(spec)
+            generator.display_solved(start, end)
+        
+        elif command in ("heatmap", "analytics"):
+            # NumPy is only needed for these commands
+            from calendar_analytics import CalendarAnalytics
+            
+            if len(sys.argv) > 2:
+                analytics = CalendarAnalytics.for_year(generator.calendar_data, int(sys.argv[2]))
+            else:
+                analytics = CalendarAnalytics(generator.calendar_data)
+            
+            if command == "heatmap":
+                print(analytics.render_heatmap())
+            else:
+                generator.display_analytics(analytics)
+        
         else:
-            print("Unknown command. Use: mark, stats, month, or year")
+            print("Unknown command. Use: mark, compact, stats, month, year, range, solved, heatmap, or analytics")
     
     else:
         # Default: show current month and stats
-        now = datetime.now()
-        print(generator.generate_month_calendar(now.year, now.month))
+        today = calendar_today()
+        print(generator.generate_month_calendar(today.year, today.month))
         generator.display_stats()
 
 
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+GraphQL Record/Replay
+Records LeetCode responses to fixtures and replays them offline with injected latency and failures
+"""
+
+import atexit
+import io
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from leetcode_client import read_body
+
+BASE_DIR = Path(__file__).parent.parent
+SCRIPTS_DIR = Path(__file__).parent
+
+# Transport selection (read by sync_leetcode)
+REPLAY_FILE = os.environ.get("LEETCODE_REPLAY")    # Serve requests from this fixture file
+RECORD_FILE = os.environ.get("LEETCODE_RECORD")    # Record live responses into this fixture file
+
+# Fault injection for replay
+REPLAY_LATENCY_MS = float(os.environ.get("REPLAY_LATENCY_MS", "0"))      # Mean added latency
+REPLAY_ERROR_RATE = float(os.environ.get("REPLAY_ERROR_RATE", "0"))      # Share of 503 responses
+REPLAY_THROTTLE_RATE = float(os.environ.get("REPLAY_THROTTLE_RATE", "0"))  # Share of 429 responses
+REPLAY_RETRY_AFTER = os.environ.get("REPLAY_RETRY_AFTER", "1")           # Retry-After sent with 429
+REPLAY_SEED = int(os.environ.get("REPLAY_SEED", "0"))
+
+BENCH_SIZES = [10, 1000, 10000]
+BENCH_PAGE_SIZE = 50
+BENCH_RATE = 1_000_000    # Requests per second; effectively no client-side throttling
+
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+TOPIC_SLUGS = [
+    "array", "string", "hash-table", "dynamic-programming", "math", "sorting", "greedy",
+    "depth-first-search", "breadth-first-search", "binary-search", "tree", "matrix",
+    "bit-manipulation", "two-pointers", "binary-tree", "heap", "stack", "graph",
+    "linked-list", "backtracking",
+]
+
+
+class Fixtures:
+    """Recorded GraphQL data: the user profile, submissions (newest first) and questions by slug"""
+    
+    def __init__(self, user=None, submissions=None, questions=None):
+        self.user = user
+        self.submissions = submissions or []
+        self.questions = questions or {}
+        self.lock = threading.Lock()
+    
+    @classmethod
+    def load(cls, path):
+        """Load fixtures from a JSON file, or start empty if it does not exist"""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('user'), data.get('submissions'), data.get('questions'))
+    
+    def save(self, path):
+        """Write fixtures atomically"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            data = {'user': self.user, 'submissions': self.submissions, 'questions': self.questions}
+        tmp_file = path.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        tmp_file.replace(path)
+    
+    def record(self, payload, data):
+        """Fold one successful GraphQL response into the fixtures"""
+        variables = payload.get('variables') or {}
+        with self.lock:
+            if data.get('matchedUser'):
+                self.user = data['matchedUser']
+            
+            submissions = data.get('recentAcSubmissionList')
+            if submissions is None and data.get('submissionList'):
+                submissions = data['submissionList']['submissions']
+            if submissions:
+                known = {s['id']: s for s in self.submissions}
+                known.update({s['id']: s for s in submissions})
+                self.submissions = sorted(
+                    known.values(), key=lambda s: (int(s['timestamp']), int(s['id'])), reverse=True
+                )
+            
+            if data.get('question'):
+                self.questions[variables['titleSlug']] = data['question']
+            for alias, question in data.items():
+                match = re.fullmatch(r"q(\d+)", alias)
+                if match and question:
+                    self.questions[variables[f"s{match.group(1)}"]] = question
+    
+    def answer(self, payload):
+        """Build the `data` object LeetCode would return for a request"""
+        query = payload['query']
+        variables = payload.get('variables') or {}
+        fields = [field for field in question_fields() if re.search(rf"\b{field}\b", query)]
+        
+        if "recentAcSubmissionList" in query:
+            accepted = [s for s in self.submissions if s['statusDisplay'] == 'Accepted']
+            return {'recentAcSubmissionList': accepted[:variables.get('limit', 20)]}
+        
+        if "submissionList" in query:
+            offset, limit = variables['offset'], variables['limit']
+            page = self.submissions[offset:offset + limit]
+            return {'submissionList': {
+                'lastKey': page[-1]['id'] if page else None,
+                'hasNext': offset + limit < len(self.submissions),
+                'submissions': page
+            }}
+        
+        if "matchedUser" in query:
+            return {'matchedUser': self.user or self.profile()}
+        
+        if "titleSlug" in variables:
+            return {'question': self.question(variables['titleSlug'], fields)}
+        
+        return {
+            f"q{name[1:]}": self.question(slug, fields)
+            for name, slug in variables.items() if re.fullmatch(r"s\d+", name)
+        }
+    
+    def question(self, slug, fields):
+        """A question restricted to the requested fields, or None if unknown"""
+        question = self.questions.get(slug)
+        if question is None:
+            return None
+        return {field: question[field] for field in fields if field in question}
+    
+    def profile(self):
+        """matchedUser payload derived from the recorded questions"""
+        counts = {difficulty: 0 for difficulty in DIFFICULTIES}
+        for question in self.questions.values():
+            counts[question['difficulty']] = counts.get(question['difficulty'], 0) + 1
+        ac = [{'difficulty': 'All', 'count': sum(counts.values())}]
+        ac += [{'difficulty': d, 'count': c} for d, c in counts.items()]
+        return {
+            'username': 'replay',
+            'submitStats': {'acSubmissionNum': ac},
+            'profile': {'ranking': 100000, 'reputation': 0}
+        }
+
+
+def question_fields():
+    """Every question field the sync can request"""
+    from sync_leetcode import QUESTION_FIELDS
+    return list(QUESTION_FIELDS)
+
+
+def synthesize(count, seed=REPLAY_SEED, start=1_700_000_000):
+    """Deterministic fixtures with `count` accepted submissions, one problem each"""
+    rng = random.Random(seed)
+    questions = {}
+    submissions = []
+    timestamp = start
+    for i in range(1, count + 1):
+        slug = f"synthetic-problem-{i}"
+        paragraphs = "".join(
+            f"<p>Given an array <code>nums</code> of length <code>n</code>, problem {i} step {j}: "
+            f"return the answer modulo <code>10<sup>9</sup> + 7</code>.</p>"
+            for j in range(rng.randint(4, 12))
+        )
+        example = "<pre><strong>Input:</strong> nums = [1,2,3]\n<strong>Output:</strong> 6</pre>"
+        questions[slug] = {
+            'questionId': str(i),
+            'title': f"Synthetic Problem {i}",
+            'titleSlug': slug,
+            'content': paragraphs + example * rng.randint(1, 3),
+            'difficulty': rng.choice(DIFFICULTIES),
+            'topicTags': [
+                {'name': topic.replace('-', ' ').title(), 'slug': topic}
+                for topic in rng.sample(TOPIC_SLUGS, rng.randint(1, 3))
+            ],
+            'codeSnippets': [
+                {'lang': 'Python3', 'code': 'class Solution:\n    def solve(self, nums):\n        '},
+                {'lang': 'C++', 'code': 'class Solution {\npublic:\n    int solve(vector<int>& nums) {\n    }\n};'}
+            ],
+            'stats': json.dumps({'totalAccepted': str(rng.randint(1000, 10**6))})
+        }
+        timestamp += rng.randint(600, 86400)
+        submissions.append({
+            'id': str(10**6 + i),
+            'title': f"Synthetic Problem {i}",
+            'titleSlug': slug,
+            'timestamp': str(timestamp),
+            'statusDisplay': 'Accepted',
+            'lang': rng.choice(['python3', 'cpp', 'java'])
+        })
+    submissions.reverse()
+    return Fixtures(submissions=submissions, questions=questions)
+
+
+class ReplayAdapter(BaseAdapter):
+    """requests transport answering GraphQL POSTs from fixtures, with injected faults
+
+    Each request sleeps for an exponentially distributed latency around
+    latency_ms, then fails with 503 at error_rate or 429 (with Retry-After) at
+    throttle_rate before being answered from the fixtures.
+    """
+    
+    def __init__(self, fixtures, latency_ms=REPLAY_LATENCY_MS, error_rate=REPLAY_ERROR_RATE,
+                 throttle_rate=REPLAY_THROTTLE_RATE, retry_after=REPLAY_RETRY_AFTER, seed=REPLAY_SEED):
+        super().__init__()
+        self.fixtures = fixtures
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+    
+    def send(self, request, **kwargs):
+        with self.lock:
+            latency = self.random.expovariate(1 / self.latency_ms) if self.latency_ms else 0
+            roll = self.random.random()
+        time.sleep(latency / 1000)
+        
+        if roll < self.error_rate:
+            return self.build(request, 503, b"")
+        if roll < self.error_rate + self.throttle_rate:
+            return self.build(request, 429, b"", {'Retry-After': self.retry_after})
+        
+        payload = json.loads(request.body)
+        body = json.dumps({'data': self.fixtures.answer(payload)}).encode()
+        return self.build(request, 200, body, {'Content-Type': 'application/json'})
+    
+    @staticmethod
+    def build(request, status, body, headers=None):
+        """Wrap a body in a requests.Response"""
+        response = requests.Response()
+        response.status_code = status
+        response.reason = "OK" if status == 200 else "Replay fault"
+        response.headers = CaseInsensitiveDict({'Content-Length': str(len(body)), **(headers or {})})
+        response.raw = io.BytesIO(body)
+        response.raw.seek(0, io.SEEK_END)
+        response._content = body
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+    
+    def close(self):
+        pass
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Pass-through transport that folds every successful response into fixtures"""
+    
+    def __init__(self, fixtures, path, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures = fixtures
+        atexit.register(fixtures.save, path)
+    
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        read_body(response)  # Keeps the client's bytes-on-the-wire count exact
+        if response.status_code == 200:
+            data = response.json().get('data')
+            if data:
+                self.fixtures.record(json.loads(request.body), data)
+        return response
+
+
+def adapter_from_env(pool_size):
+    """Replay or recording adapter selected by LEETCODE_REPLAY / LEETCODE_RECORD, else None"""
+    if REPLAY_FILE:
+        print(f"📼 Replaying GraphQL responses from {REPLAY_FILE}")
+        return ReplayAdapter(Fixtures.load(REPLAY_FILE))
+    if RECORD_FILE:
+        print(f"🔴 Recording GraphQL responses to {RECORD_FILE}")
+        return RecordingAdapter(
+            Fixtures.load(RECORD_FILE), RECORD_FILE,
+            pool_connections=1, pool_maxsize=pool_size, max_retries=0
+        )
+    return None
+
+
+def run_backfill(page_size=BENCH_PAGE_SIZE):
+    """Backfill this tree from LEETCODE_REPLAY without client throttling; prints a JSON result line"""
+    from sync_leetcode import LeetCodeSync
+    
+    with redirect_stdout(io.StringIO()):
+        syncer = LeetCodeSync(rate=BENCH_RATE, burst=BENCH_RATE)
+        start = time.perf_counter()
+        syncer.backfill(page_size=page_size, restart=True)
+        elapsed = time.perf_counter() - start
+    
+    client = syncer.client
+    print(json.dumps({
+        'seconds': elapsed,
+        'requests': client.requests,
+        'retries': client.retries,
+        'failures': client.failures,
+        'files': syncer.manifest.summary()
+    }))
+
+
+def bench(sizes, page_size=BENCH_PAGE_SIZE):
+    """Backfill synthetic histories of each size in a scratch copy of the repo"""
+    print(f"⏱️  Replay benchmark: latency {REPLAY_LATENCY_MS:.0f} ms, "
+          f"errors {REPLAY_ERROR_RATE:.1%}, throttling {REPLAY_THROTTLE_RATE:.1%}\n")
+    print(f"{'submissions':>12} {'seconds':>9} {'subs/s':>9} {'requests':>9} {'retries':>8} {'failures':>9}")
+    
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as scratch:
+            scratch = Path(scratch)
+            shutil.copytree(SCRIPTS_DIR, scratch / "scripts", ignore=shutil.ignore_patterns("__pycache__"))
+            fixture_file = scratch / "fixtures.json"
+            synthesize(size).save(fixture_file)
+            
+            env = {**os.environ, 'LEETCODE_REPLAY': str(fixture_file)}
+            env.pop('LEETCODE_RECORD', None)
+            result = subprocess.run(
+                [sys.executable, str(scratch / "scripts" / "graphql_replay.py"), "run", str(page_size)],
+                cwd=scratch, env=env, capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                print(f"❌ {size} submissions failed:\n{result.stderr}")
+                continue
+            
+            run = json.loads(result.stdout.strip().splitlines()[-1])
+            rate = size / run['seconds'] if run['seconds'] else 0
+            print(f"{size:>12} {run['seconds']:>9.2f} {rate:>9.0f} {run['requests']:>9} "
+                  f"{run['retries']:>8} {run['failures']:>9}")
+
+
+def main():
+    """Main entry point"""
+    if len(sys.argv) > 1:
+        command = sys.argv[1]
+        args = sys.argv[2:]
+        
+        if command == "synth":
+            # Write a synthetic fixture file
+            count = int(args[0]) if args else 100
+            path = args[1] if len(args) > 1 else "fixtures.json"
+            synthesize(count).save(path)
+            print(f"✅ Wrote {count} synthetic submissions to {path}")
+        
+        elif command == "bench":
+            # Benchmark backfill at several history sizes
+            sizes = [int(arg) for arg in args] or BENCH_SIZES
+            bench(sizes)
+        
+        elif command == "run":
+            # One replayed backfill of this tree (used by bench)
+            if not REPLAY_FILE:
+                print("❌ Set LEETCODE_REPLAY to a fixture file")
+                sys.exit(1)
+            run_backfill(int(args[0]) if args else BENCH_PAGE_SIZE)
+        
+        else:
+            print("Unknown command. Use: synth [count] [path], bench [sizes...], or run [page_size]")
+    
+    else:
+        bench(BENCH_SIZES)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+HTML to Markdown
+Converts LeetCode problem statements to Markdown with a content-hash LRU cache
+"""
+
+import hashlib
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from html.parser import HTMLParser
+
+CACHE_SIZE = 4096  # Converted statements kept in memory, keyed by content hash
+
+WHITESPACE = re.compile(r"\s+")
+TRAILING_SPACE = re.compile(r"[ \t]+\n")
+BLANK_LINES = re.compile(r"\n{3,}")
+HEADINGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+BLOCK_TAGS = {"p", "div", "blockquote", "table", "tr"}
+# Opening and closing Markdown for inline tags; 10<sup>9</sup> becomes 10^9
+INLINE_MARKERS = {
+    "strong": ("**", "**"), "b": ("**", "**"), "em": ("*", "*"), "i": ("*", "*"),
+    "sup": ("^", ""), "sub": ("_", ""),
+}
+
+
+class MarkdownConverter(HTMLParser):
+    """Single-use parser turning the HTML subset LeetCode uses into Markdown
+
+    Paragraphs, line breaks, emphasis, inline code, <pre> blocks, nested
+    lists, links, images, headings and <sup>/<sub> are converted; any other
+    tag is dropped and its text kept.
+    """
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.pre = 0
+        self.code = 0
+        self.lists = []
+        self.links = []
+        self.pre_start = False
+    
+    def tail(self):
+        """The last few characters written so far"""
+        return "".join(self.out[-3:])[-2:]
+    
+    def block(self):
+        """Start a new paragraph"""
+        if self.out and not self.tail().endswith("\n\n"):
+            self.out.append("\n" if self.tail().endswith("\n") else "\n\n")
+    
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in BLOCK_TAGS:
+            self.block()
+        elif tag == "br":
+            self.out.append("\n")
+        elif tag == "pre":
+            self.block()
+            self.out.append("```\n")
+            self.pre += 1
+            self.pre_start = True
+        elif self.pre:
+            return  # Formatting inside <pre> cannot be expressed in a fenced block
+        elif tag == "code":
+            self.out.append("`")
+            self.code += 1
+        elif tag in INLINE_MARKERS:
+            self.out.append(INLINE_MARKERS[tag][0])
+        elif tag in ("ul", "ol"):
+            if not self.lists:
+                self.block()
+            self.lists.append([tag, 0])
+        elif tag == "li" and self.lists:
+            kind = self.lists[-1]
+            kind[1] += 1
+            marker = "- " if kind[0] == "ul" else f"{kind[1]}. "
+            self.out.append("\n" + "   " * (len(self.lists) - 1) + marker)
+        elif tag in HEADINGS:
+            self.block()
+            self.out.append("#" * int(tag[1]) + " ")
+        elif tag == "a":
+            self.links.append(attrs.get("href"))
+            self.out.append("[")
+        elif tag == "img":
+            self.out.append(f"![{attrs.get('alt') or ''}]({attrs.get('src') or ''})")
+    
+    def handle_endtag(self, tag):
+        if tag in BLOCK_TAGS or tag in HEADINGS:
+            self.block()
+        elif tag == "pre":
+            self.pre -= 1
+            if not self.tail().endswith("\n"):
+                self.out.append("\n")
+            self.out.append("```\n\n")
+        elif self.pre:
+            return
+        elif tag == "code" and self.code:
+            self.out.append("`")
+            self.code -= 1
+        elif tag in INLINE_MARKERS:
+            # "**bold **" does not render; move trailing space outside the marker
+            closing = INLINE_MARKERS[tag][1]
+            if self.out and self.out[-1].endswith(" "):
+                self.out[-1] = self.out[-1].rstrip(" ")
+                closing += " "
+            self.out.append(closing)
+        elif tag in ("ul", "ol") and self.lists:
+            self.lists.pop()
+            if not self.lists:
+                self.block()
+        elif tag == "a" and self.links:
+            href = self.links.pop()
+            self.out.append(f"]({href})" if href else "]")
+    
+    def handle_data(self, data):
+        data = data.replace("\xa0", " ")
+        if self.pre:
+            # Like browsers, ignore the newline right after <pre>
+            if self.pre_start and data.startswith("\n"):
+                data = data[1:]
+            self.pre_start = False
+            self.out.append(data)
+            return
+        
+        data = WHITESPACE.sub(" ", data)
+        if not self.out or self.tail().endswith("\n") or self.tail().endswith("- "):
+            data = data.lstrip()
+        if data and not self.code:
+            data = data.replace("*", r"\*")
+        if data:
+            self.out.append(data)
+    
+    def markdown(self):
+        """The converted document"""
+        text = "".join(self.out)
+        text = TRAILING_SPACE.sub("\n", text)
+        text = BLANK_LINES.sub("\n\n", text)
+        return text.strip()
+
+
+def convert(html):
+    """Convert an HTML fragment to Markdown (uncached)"""
+    parser = MarkdownConverter()
+    parser.feed(html)
+    parser.close()
+    return parser.markdown()
+
+
+def content_hash(html):
+    """Hex BLAKE2 digest identifying a statement's HTML"""
+    return hashlib.blake2b(html.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ConversionCache:
+    """Thread-safe LRU of converted statements keyed by a hash of the HTML"""
+    
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def convert(self, html):
+        """Markdown for html, converted at most once per distinct content"""
+        key = content_hash(html)
+        with self.lock:
+            markdown = self.entries.get(key)
+            if markdown is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return markdown
+            self.misses += 1
+        
+        markdown = convert(html)
+        with self.lock:
+            self.entries[key] = markdown
+            if len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+        return markdown
+    
+    def clear(self):
+        """Drop all entries and reset counters"""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+conversion_cache = ConversionCache()
+
+
+def html_to_markdown(html):
+    """Convert a problem statement to Markdown through the shared cache"""
+    if not html:
+        return ""
+    return conversion_cache.convert(html)
+
+
+def bench(questions):
+    """Report bytes saved and conversion throughput for a set of questions"""
+    statements = [q['content'] for q in questions if q.get('content')]
+    if not statements:
+        print("❌ No statements to convert")
+        return
+    
+    conversion_cache.clear()
+    start = time.perf_counter()
+    converted = [html_to_markdown(html) for html in statements]
+    cold = time.perf_counter() - start
+    
+    misses = conversion_cache.misses
+    conversion_cache.hits = 0
+    start = time.perf_counter()
+    for html in statements:
+        html_to_markdown(html)
+    warm = time.perf_counter() - start
+    
+    html_bytes = sum(len(html.encode('utf-8')) for html in statements)
+    markdown_bytes = sum(len(markdown.encode('utf-8')) for markdown in converted)
+    per_k = 1000 / len(statements)
+    
+    print(f"📄 {len(statements)} statement(s)")
+    print(f"   HTML:      {html_bytes / 1024:10.1f} KB")
+    print(f"   Markdown:  {markdown_bytes / 1024:10.1f} KB")
+    print(f"   Saved:     {(html_bytes - markdown_bytes) / 1024:10.1f} KB "
+          f"({(html_bytes - markdown_bytes) / html_bytes:.1%}), "
+          f"{(html_bytes - markdown_bytes) * per_k / 1024:.1f} KB per 1k problems")
+    print(f"⚡ Cold: {cold * per_k * 1000:8.1f} ms per 1k problems "
+          f"({len(statements) / cold:,.0f}/s, {misses} conversion(s))")
+    print(f"⚡ Warm: {warm * per_k * 1000:8.1f} ms per 1k problems "
+          f"({len(statements) / warm:,.0f}/s, {conversion_cache.hits} cache hit(s))")
+
+
+def main():
+    """Main entry point"""
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        # Statements from a replay fixture file, or synthetic ones
+        from graphql_replay import Fixtures, synthesize
+        
+        arg = sys.argv[2] if len(sys.argv) > 2 else "1000"
+        fixtures = synthesize(int(arg)) if arg.isdigit() else Fixtures.load(arg)
+        bench(list(fixtures.questions.values()))
+    
+    elif len(sys.argv) > 1 and sys.argv[1] == "convert":
+        # Convert HTML on stdin
+        print(convert(sys.stdin.read()))
+    
+    else:
+        print("Unknown command. Use: bench [count|fixture.json], or convert < file.html")
+
+
+if __name__ == "__main__":
+    main()
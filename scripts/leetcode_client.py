@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+LeetCode HTTP Client
+Pooled GraphQL client with timeouts, retry/backoff and request counters
+"""
+
+import gzip
+import random
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+try:
+    import brotli
+except ImportError:  # br is only requested when a decoder is installed
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+POOL_SIZE = 8                    # Keep-alive connections kept open to LeetCode
+CONNECT_TIMEOUT = 5              # Seconds to establish a connection
+READ_TIMEOUT = 30                # Seconds to wait for a response
+MAX_RETRIES = 5                  # Retries after the first attempt
+BACKOFF_BASE = 1.0               # Seconds, doubled on every retry
+BACKOFF_CAP = 60.0               # Upper bound for a single jittered backoff
+RETRY_AFTER_MAX = 900.0          # Longer server-requested waits fail the request instead
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+CHUNK_SIZE = 64 * 1024           # Bytes read from the socket at a time
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli else "gzip, deflate"
+DECODE_ERRORS = (OSError, EOFError, zlib.error) + ((brotli.error,) if brotli else ())
+
+# Errors worth another attempt: the connection failed, timed out, or broke mid-body
+TRANSIENT_ERRORS = (
+    requests.ConnectionError, requests.Timeout,
+    requests.exceptions.ChunkedEncodingError, requests.exceptions.ContentDecodingError
+)
+
+
+def decode_body(body, content_encoding):
+    """Undo the Content-Encoding of a body (gzip, deflate or br, applied in order)"""
+    codings = [coding.strip().lower() for coding in (content_encoding or "").split(",") if coding.strip()]
+    try:
+        for coding in reversed(codings):
+            if coding in ("gzip", "x-gzip"):
+                body = gzip.decompress(body)
+            elif coding == "deflate":
+                try:
+                    body = zlib.decompress(body)
+                except zlib.error:
+                    body = zlib.decompress(body, -zlib.MAX_WBITS)  # Raw deflate without a zlib header
+            elif coding == "br" and brotli:
+                body = brotli.decompress(body)
+            elif coding != "identity":
+                raise requests.exceptions.ContentDecodingError(f"Unsupported Content-Encoding '{coding}'")
+    except DECODE_ERRORS as e:
+        raise requests.exceptions.ContentDecodingError(e)
+    return body
+
+
+def read_body(response):
+    """Read a streamed body as transferred, then decode it; returns the bytes on the wire
+    
+    Counting the raw stream works for chunked responses, where urllib3 does
+    not track the bytes read. Bodies already read by the transport (the
+    replay adapter) count as their Content-Length.
+    """
+    if response._content is not False:
+        wire_bytes = getattr(response, 'wire_bytes', None)
+        if wire_bytes is None:
+            try:
+                wire_bytes = int(response.headers.get('Content-Length', ''))
+            except ValueError:
+                wire_bytes = len(response.content)
+        return wire_bytes
+    
+    try:
+        wire = b"".join(response.raw.stream(CHUNK_SIZE, decode_content=False))
+    except ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e)
+    except ReadTimeoutError as e:
+        raise requests.ConnectionError(e)
+    finally:
+        response.raw.release_conn()
+    
+    response._content = decode_body(wire, response.headers.get('Content-Encoding'))
+    response._content_consumed = True
+    response.wire_bytes = len(wire)
+    return response.wire_bytes
+
+
+class LeetCodeClient:
+    """POSTs GraphQL requests over a pooled session, retrying transient failures
+
+    429 and 5xx responses and connection errors are retried with exponential
+    backoff and full jitter; a Retry-After header sets the minimum wait, and one
+    longer than retry_after_max fails the request rather than stalling the run.
+    """
+    
+    def __init__(self, url, rate_limiter=None, pool_size=POOL_SIZE,
+                 timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), max_retries=MAX_RETRIES,
+                 retry_after_max=RETRY_AFTER_MAX, adapter=None):
+        self.url = url
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_after_max = retry_after_max
+        
+        self.session = requests.Session()
+        # A replay or recording adapter can stand in for the network transport
+        adapter = adapter or HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Bodies are decoded by read_body, so only codings it can undo are requested
+        self.session.headers.update({'Connection': 'keep-alive', 'Accept-Encoding': ACCEPT_ENCODING})
+        
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.bytes_wire = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+    
+    def post(self, payload):
+        """POST a JSON payload; returns the final response, or None if every attempt errored"""
+        response = None
+        
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            
+            start = time.perf_counter()
+            try:
+                # Streamed so the compressed body can be counted before it is decoded
+                response = self.session.post(self.url, json=payload, timeout=self.timeout, stream=True)
+                wire_bytes = read_body(response)
+                error = None
+            except TRANSIENT_ERRORS as e:
+                response, wire_bytes, error = None, 0, e
+            self.record(start, response, wire_bytes)
+            
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                return response
+            
+            if attempt == self.max_retries:
+                break
+            
+            retry_after = self.retry_after(response)
+            if retry_after is not None and retry_after > self.retry_after_max:
+                print(f"❌ HTTP {response.status_code} with Retry-After {retry_after:.0f}s "
+                      f"(over {self.retry_after_max:.0f}s), not retrying")
+                break
+            
+            delay = self.backoff(attempt, retry_after)
+            reason = error.__class__.__name__ if error else f"HTTP {response.status_code}"
+            print(f"⏳ {reason}, retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+            with self.lock:
+                self.retries += 1
+            time.sleep(delay)
+        
+        with self.lock:
+            self.failures += 1
+        print(f"❌ Request failed after {attempt + 1} attempt(s)")
+        return response
+    
+    @staticmethod
+    def backoff(attempt, retry_after=None):
+        """Delay before the next attempt: capped full jitter, at least the whole Retry-After"""
+        delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+    
+    @staticmethod
+    def retry_after(response):
+        """Parse a Retry-After header (seconds or HTTP date)"""
+        value = response.headers.get('Retry-After') if response is not None else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+    
+    def record(self, start, response, wire_bytes=0):
+        """Update counters for one attempt"""
+        latency = time.perf_counter() - start
+        with self.lock:
+            self.requests += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            if response is not None:
+                self.bytes_sent += len(response.request.body or b"")
+                self.bytes_received += len(response.content)
+                self.bytes_wire += wire_bytes
+    
+    def summary(self):
+        """One-line summary of request counters"""
+        average = self.latency_total / self.requests * 1000 if self.requests else 0
+        ratio = f", {self.bytes_received / self.bytes_wire:.1f}x" if self.bytes_wire else ""
+        return (
+            f"{self.requests} request(s), {self.retries} retr{'y' if self.retries == 1 else 'ies'}, "
+            f"{self.failures} failure(s), {self.bytes_sent / 1024:.1f} KB sent, "
+            f"{self.bytes_received / 1024:.1f} KB received "
+            f"({self.bytes_wire / 1024:.1f} KB on the wire{ratio}), "
+            f"latency avg {average:.0f} ms / max {self.latency_max * 1000:.0f} ms"
+        )
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Pipeline Script
+Runs sync, calendar mark and README update in one process over shared state
+"""
+
+import sys
+import time
+
+from generate_calendar import CalendarGenerator
+from sync_leetcode import LeetCodeSync
+from update_readme import ReadmeUpdater
+
+STAGES = ["sync", "calendar", "readme"]
+
+
+class Pipeline:
+    def __init__(self, skip=()):
+        self.skip = set(skip)
+        self.timings = []
+        self.syncer = None
+        self.stats = None
+        self.generator = None
+    
+    def run_stage(self, name, stage):
+        """Run one stage unless skipped, recording its wall time"""
+        if name in self.skip:
+            print(f"⏭️  Skipping {name}")
+            self.timings.append((name, None))
+            return
+        
+        start = time.perf_counter()
+        stage()
+        self.timings.append((name, time.perf_counter() - start))
+    
+    def sync(self):
+        """Sync submissions; keeps the syncer's index, manifest and stats in memory"""
+        # Calendar marks are merged by the calendar stage instead
+        self.syncer = LeetCodeSync(record_calendar=False)
+        self.stats = self.syncer.sync()
+    
+    def calendar(self):
+        """Mark solve days derived from the synced submissions"""
+        self.generator = CalendarGenerator()
+        if self.syncer:
+            self.generator.record_events(self.syncer.calendar_events)
+    
+    def readme(self):
+        """Render the README from the in-memory state of earlier stages"""
+        updater = ReadmeUpdater(
+            stats=self.stats,
+            problem_index=self.syncer.problem_index if self.syncer else None,
+            calendar_data=self.generator.calendar_data if self.generator else None,
+            manifest=self.syncer.manifest if self.syncer else None
+        )
+        updater.update()
+    
+    def run(self):
+        """Run all stages in order and report timings"""
+        self.run_stage("sync", self.sync)
+        self.run_stage("calendar", self.calendar)
+        self.run_stage("readme", self.readme)
+        self.report()
+    
+    def report(self):
+        """Print per-stage timing"""
+        print("\n" + "="*50)
+        print("  ⏱️  PIPELINE TIMINGS")
+        print("="*50)
+        total = 0
+        for name, elapsed in self.timings:
+            if elapsed is None:
+                print(f"  {name:<10} skipped")
+            else:
+                total += elapsed
+                print(f"  {name:<10} {elapsed:8.2f}s")
+        print(f"  {'total':<10} {total:8.2f}s")
+        print("="*50 + "\n")
+
+
+def main():
+    """Main entry point"""
+    skip = [arg[len("--skip-"):] for arg in sys.argv[1:] if arg.startswith("--skip-")]
+    unknown = [stage for stage in skip if stage not in STAGES]
+    if unknown:
+        print(f"Unknown stage(s): {', '.join(unknown)}. Stages: {', '.join(STAGES)}")
+        sys.exit(1)
+    
+    Pipeline(skip).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Problem Index
+Persistent index of saved problem files, so readers never walk problems/
+"""
+
+import json
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from content_manifest import write_json_entries
+from streaks import CALENDAR_TZ, local_date
+from topic_index import TopicIndex
+
+BASE_DIR = Path(__file__).parent.parent
+STATS_DIR = BASE_DIR / "stats"
+PROBLEMS_DIR = BASE_DIR / "problems"
+
+INDEX_FILE = STATS_DIR / "problem_index.json"
+DIFFICULTIES = ["easy", "medium", "hard"]
+HEADER_BUFFER = 1024  # Bytes per read while parsing a problem file header
+
+
+def solved_date(timestamp):
+    """Calendar date (YYYY-MM-DD) of a solve timestamp in CALENDAR_TIMEZONE"""
+    return local_date(timestamp).isoformat()
+
+
+def format_front_matter(metadata):
+    """Render metadata as a front matter block
+    
+    Values are JSON encoded, which is also valid YAML, so GitHub renders the
+    block and read_problem_header can parse it without a YAML dependency.
+    """
+    lines = ["---"]
+    for key, value in metadata.items():
+        lines.append(f"{key}: {json.dumps(value, ensure_ascii=False)}")
+    lines.append("---")
+    return "\n".join(lines) + "\n"
+
+
+def read_problem_header(filepath):
+    """Read only the metadata at the top of a problem file
+    
+    Parses the front matter block if present, otherwise the legacy title and
+    **Field:** lines, and stops at the first horizontal rule so the problem
+    statement is never read.
+    """
+    header = {}
+    with open(filepath, 'r', encoding='utf-8', buffering=HEADER_BUFFER) as f:
+        first = f.readline().rstrip('\n')
+        
+        if first == "---":
+            for line in f:
+                line = line.rstrip('\n')
+                if line == "---":
+                    break
+                key, _, value = line.partition(':')
+                header[key.strip()] = json.loads(value)
+            return header
+        
+        title_line = first.replace('#', '').strip()
+        parts = title_line.split('.', 1)
+        if len(parts) == 2:
+            header['id'], header['title'] = parts[0].strip(), parts[1].strip()
+        else:
+            header['id'], header['title'] = "?", title_line
+        
+        for line in f:
+            line = line.strip()
+            if line == "---":
+                break
+            if line.startswith('**Solved:**'):
+                solved = line.replace('**Solved:**', '').strip()
+                header['solved_at'] = int(datetime.strptime(solved, '%Y-%m-%d %H:%M:%S').replace(tzinfo=CALENDAR_TZ).timestamp())
+            elif line.startswith('**Difficulty:**'):
+                header['difficulty'] = line.replace('**Difficulty:**', '').strip()
+    
+    return header
+
+
+class ProblemIndex:
+    """Records keyed by repo-relative path of each problem markdown file
+
+    Each record holds id, title, slug, difficulty, topic (the directory the
+    file lives in), topics (all tag slugs), solved_at, solved_date, lang, path
+    and mtime. solved_date is precomputed from solved_at so readers never need to
+    stat the file or re-format timestamps. The topic index (every tag of every
+    problem) is maintained alongside and saved with it.
+    """
+    
+    def __init__(self, path=INDEX_FILE, topic_index=None):
+        self.path = Path(path)
+        self.records = self.load()
+        self.dirty = False
+        
+        # Problems indexed for the first time in this run, by difficulty
+        self.ids = {record['id'] for record in self.records.values()}
+        self.new_problems = Counter()
+        
+        self.topics = topic_index or TopicIndex()
+        if self.records and not self.topics.path.exists():
+            # Indexes written before the topic index existed seed it once
+            self.topics.rebuild(self.records.values())
+    
+    def load(self):
+        """Load the index"""
+        if not self.path.exists():
+            return {}
+        
+        with open(self.path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        
+        # Records written before solved_date existed get it filled in once
+        for record in records.values():
+            if 'solved_date' not in record and record.get('solved_at'):
+                record['solved_date'] = solved_date(record['solved_at'])
+        return records
+    
+    def save(self):
+        """Save the index and topic index if they changed"""
+        self.topics.save()
+        if not self.dirty:
+            return
+        
+        write_json_entries(self.path, self.records)
+        self.dirty = False
+    
+    @staticmethod
+    def relative_path(filepath):
+        """Repo-relative posix path for a problem file"""
+        return Path(filepath).resolve().relative_to(BASE_DIR.resolve()).as_posix()
+    
+    def upsert(self, record):
+        """Insert or replace a record"""
+        if self.records.get(record['path']) != record:
+            self.records[record['path']] = record
+            self.dirty = True
+    
+    def record_problem(self, filepath, problem, submission):
+        """Build and store the record for a freshly saved problem"""
+        filepath = Path(filepath)
+        self.upsert({
+            'id': problem['questionId'],
+            'title': problem['title'],
+            'slug': problem['titleSlug'],
+            'difficulty': problem['difficulty'].lower(),
+            'topic': filepath.parent.name,
+            'topics': [tag['slug'] for tag in problem['topicTags']],
+            'solved_at': int(submission['timestamp']),
+            'solved_date': solved_date(int(submission['timestamp'])),
+            'lang': submission['lang'],
+            'path': self.relative_path(filepath),
+            'mtime': filepath.stat().st_mtime
+        })
+        if problem['questionId'] not in self.ids:
+            self.ids.add(problem['questionId'])
+            self.new_problems[problem['difficulty'].lower()] += 1
+        # Untagged problems are listed under their directory topic, as rebuild() does
+        self.topics.add(problem['questionId'], problem['topicTags'] or [filepath.parent.name])
+    
+    def difficulty_counts(self):
+        """Distinct indexed problems per difficulty"""
+        by_id = {record['id']: record['difficulty'] for record in self.records.values()}
+        return Counter(by_id.values())
+    
+    @staticmethod
+    def parse_problem_file(filepath):
+        """Build a record from an existing problem file's header"""
+        filepath = Path(filepath)
+        header = read_problem_header(filepath)
+        mtime = filepath.stat().st_mtime
+        
+        # Legacy files without a solve time fall back to the modification time
+        solved_at = header.get('solved_at') or int(mtime)
+        
+        return {
+            'id': header['id'],
+            'title': header['title'],
+            'slug': header.get('slug', filepath.stem.split('_', 1)[-1]),
+            'difficulty': filepath.parent.parent.name,
+            'topic': filepath.parent.name,
+            'topics': header.get('topics', [filepath.parent.name]),
+            'solved_at': solved_at,
+            'solved_date': solved_date(solved_at),
+            'lang': header.get('lang'),
+            'path': ProblemIndex.relative_path(filepath),
+            'mtime': mtime
+        }
+    
+    def reconcile(self):
+        """Rebuild the index from the files under problems/"""
+        records = {}
+        for difficulty in DIFFICULTIES:
+            diff_dir = PROBLEMS_DIR / difficulty
+            if not diff_dir.exists():
+                continue
+            
+            for problem_file in diff_dir.glob("*/*.md"):
+                path = self.relative_path(problem_file)
+                existing = self.records.get(path)
+                
+                # Files untouched since they were indexed keep their richer record
+                # (records from before lang was indexed are re-read once)
+                if existing and existing['mtime'] == problem_file.stat().st_mtime and 'lang' in existing:
+                    # Dates follow the current CALENDAR_TIMEZONE
+                    records[path] = {**existing, 'solved_date': solved_date(existing['solved_at'])}
+                else:
+                    records[path] = self.parse_problem_file(problem_file)
+        
+        if records != self.records:
+            self.records = records
+            self.dirty = True
+        self.ids = {record['id'] for record in records.values()}
+        self.topics.rebuild(records.values())
+        return records
+
+
+def main():
+    """Main entry point"""
+    import sys
+    
+    index = ProblemIndex()
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "reconcile":
+        before = len(index.records)
+        index.reconcile()
+        index.save()
+        print(f"✅ Index reconciled: {before} -> {len(index.records)} problem(s), "
+              f"{len(index.topics.counts())} topic(s)")
+    else:
+        print("Unknown command. Use: reconcile")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Problem Store
+SQLite query layer over the problem index for ad-hoc filtering of solved problems
+"""
+
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from problem_index import ProblemIndex
+from streaks import day_start
+
+BASE_DIR = Path(__file__).parent.parent
+STATS_DIR = BASE_DIR / "stats"
+
+STORE_FILE = STATS_DIR / "problems.db"
+SCHEMA_VERSION = 1  # Bump when the schema changes; the tables are then recreated
+
+SCHEMA = """
+DROP TABLE IF EXISTS meta;
+DROP TABLE IF EXISTS problem_topics;
+DROP TABLE IF EXISTS problems;
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE problems (
+    path TEXT PRIMARY KEY,
+    id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    slug TEXT,
+    difficulty TEXT NOT NULL,
+    topic TEXT,
+    solved_at INTEGER,
+    solved_date TEXT,
+    lang TEXT
+);
+CREATE TABLE problem_topics (
+    path TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    PRIMARY KEY (topic, path)
+) WITHOUT ROWID;
+CREATE INDEX problems_difficulty ON problems (difficulty, solved_at);
+CREATE INDEX problems_solved_at ON problems (solved_at);
+CREATE INDEX problems_lang ON problems (lang, solved_at);
+"""
+
+COLUMNS = ["path", "id", "title", "slug", "difficulty", "topic", "solved_at", "solved_date", "lang"]
+
+
+class ProblemStore:
+    """Solved problems in SQLite, indexed on difficulty, topic, solved_at and lang
+
+    The store is derived from stats/problem_index.json and rebuilt whenever
+    the index changes, so it never needs to be committed or migrated.
+    """
+    
+    def __init__(self, path=STORE_FILE, problem_index=None, force=False):
+        self.path = Path(path)
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.db.executescript(SCHEMA)
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.refresh(problem_index or ProblemIndex(), force=force)
+    
+    def close(self):
+        self.db.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    @staticmethod
+    def fingerprint(index):
+        """Identifies the index contents the store was built from"""
+        if index.dirty or not index.path.exists():
+            return None  # Unsaved changes: rebuild every time
+        stat = index.path.stat()
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+    
+    def refresh(self, index, force=False):
+        """Rebuild the tables if the problem index changed since the last build (or if forced)"""
+        fingerprint = self.fingerprint(index)
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if not force and fingerprint and row and row['value'] == fingerprint:
+            return False
+        
+        records = list(index.records.values())
+        with self.db:
+            self.db.execute("DELETE FROM problem_topics")
+            self.db.execute("DELETE FROM problems")
+            self.db.executemany(
+                f"INSERT INTO problems VALUES ({', '.join('?' * len(COLUMNS))})",
+                ([record.get(column) for column in COLUMNS] for record in records)
+            )
+            self.db.executemany(
+                "INSERT OR IGNORE INTO problem_topics VALUES (?, ?)",
+                ((record['path'], topic) for record in records
+                 for topic in record.get('topics') or [record['topic']])
+            )
+            self.db.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (fingerprint or "",)
+            )
+        return True
+    
+    def where(self, difficulty=None, topic=None, since=None, until=None, lang=None):
+        """SQL WHERE clause and parameters for a filter (dates are inclusive)"""
+        clauses, params = [], []
+        if difficulty:
+            clauses.append("p.difficulty = ?")
+            params.append(difficulty.lower())
+        if topic:
+            clauses.append("p.path IN (SELECT path FROM problem_topics WHERE topic = ?)")
+            params.append(topic)
+        if since:
+            clauses.append("p.solved_at >= ?")
+            params.append(day_start(since))
+        if until:
+            clauses.append("p.solved_at < ?")
+            params.append(day_start(until + timedelta(days=1)))
+        if lang:
+            clauses.append("p.lang = ?")
+            params.append(lang)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+    
+    def query(self, limit=None, **filters):
+        """Problems matching the filters, most recently solved first"""
+        where, params = self.where(**filters)
+        sql = f"SELECT p.* FROM problems p{where} ORDER BY p.solved_at DESC, p.path"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.db.execute(sql, params)]
+    
+    def count(self, **filters):
+        """Number of problems matching the filters"""
+        where, params = self.where(**filters)
+        return self.db.execute(f"SELECT COUNT(*) FROM problems p{where}", params).fetchone()[0]
+    
+    def counts_by(self, column, **filters):
+        """{value: count} grouped by difficulty, solved_date, lang or topic"""
+        where, params = self.where(**filters)
+        if column == "topic":
+            sql = (f"SELECT t.topic, COUNT(*) FROM problems p JOIN problem_topics t "
+                   f"ON t.path = p.path{where} GROUP BY t.topic")
+        elif column in ("difficulty", "solved_date", "lang"):
+            sql = f"SELECT p.{column}, COUNT(*) FROM problems p{where} GROUP BY p.{column}"
+        else:
+            raise ValueError(f"Cannot group by '{column}'")
+        return dict(self.db.execute(sql, params).fetchall())
+
+
+def parse_filters(args):
+    """Parse --difficulty/--topic/--since/--until/--lang/--limit flags"""
+    filters = {}
+    flags = iter(args)
+    for flag in flags:
+        value = next(flags, None)
+        if value is None or not flag.startswith("--"):
+            raise ValueError(f"Expected --flag value, got '{flag}'")
+        name = flag[2:]
+        if name in ("since", "until"):
+            filters[name] = date.fromisoformat(value)
+        elif name == "limit":
+            filters[name] = int(value)
+        elif name in ("difficulty", "topic", "lang"):
+            filters[name] = value
+        else:
+            raise ValueError(f"Unknown flag '{flag}'")
+    return filters
+
+
+def main():
+    """Main entry point"""
+    usage = ("Unknown command. Use: query [--difficulty D] [--topic T] [--since YYYY-MM-DD] "
+             "[--until YYYY-MM-DD] [--lang L] [--limit N], count [...], or rebuild")
+    
+    if len(sys.argv) < 2 or sys.argv[1] not in ("query", "count", "rebuild"):
+        print(usage)
+        return
+    
+    command = sys.argv[1]
+    try:
+        filters = parse_filters(sys.argv[2:])
+    except ValueError as e:
+        print(f"❌ {e}")
+        print(usage)
+        sys.exit(1)
+    
+    with ProblemStore(force=command == "rebuild") as store:
+        if command == "rebuild":
+            print(f"✅ Store rebuilt: {store.count()} problem(s)")
+            return
+        
+        start = time.perf_counter()
+        if command == "count":
+            filters.pop('limit', None)
+            print(store.count(**filters))
+        else:
+            rows = store.query(**filters)
+            for row in rows:
+                print(f"{row['solved_date'] or '-':<10}  {row['difficulty']:<6}  {row['id']:>5}. "
+                      f"{row['title']}  ({row['lang'] or '-'})  {row['path']}")
+            print(f"📋 {len(rows)} problem(s)")
+        print(f"⏱️  {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
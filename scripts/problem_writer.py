@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Problem Writer
+Renders problem markdown in a process pool and writes it from I/O threads
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from html_markdown import html_to_markdown
+from problem_index import format_front_matter
+from streaks import local_time
+
+BASE_DIR = Path(__file__).parent.parent
+PROBLEMS_DIR = BASE_DIR / "problems"
+
+RENDER_PROCESSES = max(1, min(4, (os.cpu_count() or 1) - 1))  # Markdown render workers
+IO_THREADS = 4                                                # Concurrent file writers
+MAX_IN_FLIGHT = 64                                            # Problems rendering or writing at once
+
+
+def problem_path(problem, problems_dir=PROBLEMS_DIR):
+    """problems/<difficulty>/<primary topic>/<id>_<slug>.md for a question"""
+    topics = [tag['slug'] for tag in problem['topicTags']]
+    primary_topic = topics[0] if topics else 'miscellaneous'
+    filename = f"{problem['questionId']}_{problem['titleSlug']}.md"
+    return Path(problems_dir) / problem['difficulty'].lower() / primary_topic / filename
+
+
+def problem_statement(problem):
+    """Statement as Markdown, or a note saying why there is none"""
+    if 'content' not in problem:
+        # Only the minimal query profile leaves the field out
+        return '_Statement not fetched with the minimal query profile._'
+    if not problem['content']:
+        # LeetCode returns null for premium-only problems without a premium session
+        return '_Statement not available (premium-only problem)._'
+    return html_to_markdown(problem['content'])
+
+
+def render_problem_markdown(problem, submission, statement=None):
+    """Generate markdown for problem (statement: already converted Markdown, if any)"""
+    if statement is None:
+        statement = problem_statement(problem)
+    topics_str = ", ".join([tag['name'] for tag in problem['topicTags']])
+    front_matter = format_front_matter({
+        'id': problem['questionId'],
+        'title': problem['title'],
+        'slug': problem['titleSlug'],
+        'difficulty': problem['difficulty'],
+        'topics': [tag['slug'] for tag in problem['topicTags']],
+        'solved_at': int(submission['timestamp']),
+        'lang': submission['lang']
+    })
+    
+    markdown = f"""{front_matter}
+# {problem['questionId']}. {problem['title']}
+
+**Difficulty:** {problem['difficulty']}  
+**Topics:** {topics_str}  
+**Link:** [LeetCode](https://leetcode.com/problems/{problem['titleSlug']}/)  
+**Solved:** {local_time(submission['timestamp']).strftime('%Y-%m-%d %H:%M:%S')}
+
+---
+
+## Problem Statement
+
+{statement}
+
+---
+
+## Solution
+
+```{submission['lang']}
+// Solution will be added here
+// Language: {submission['lang']}
+```
+
+---
+
+## Complexity Analysis
+
+- **Time Complexity:** O(?)
+- **Space Complexity:** O(?)
+
+---
+
+## Notes
+
+Add your notes here...
+
+---
+
+## Related Problems
+
+- Problem 1
+- Problem 2
+
+"""
+    return markdown
+
+
+def render_problem(problem, submission, statement=None):
+    """Render in a worker process: (file content, statement Markdown)"""
+    if statement is None:
+        statement = problem_statement(problem)
+    return render_problem_markdown(problem, submission, statement), statement
+
+
+class ProblemWriter:
+    """Overlapping render and write stages for saving many problems
+    
+    submit() hands a problem to the render pool and returns immediately;
+    rendered markdown is written by I/O threads through the manifest, and each
+    problem is recorded in the index (in submission order) once its file is on
+    disk. At most max_in_flight problems are pending, so memory stays bounded.
+    Statements already converted are taken from question_cache, and newly
+    converted ones are stored there, so workers never convert one twice.
+    """
+    
+    def __init__(self, manifest, problem_index, question_cache=None, processes=RENDER_PROCESSES,
+                 io_threads=IO_THREADS, max_in_flight=MAX_IN_FLIGHT):
+        self.manifest = manifest
+        self.problem_index = problem_index
+        self.question_cache = question_cache
+        self.max_in_flight = max_in_flight
+        # spawn: forking while fetch threads hold locks is unsafe
+        self.renderers = ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn"))
+        self.writers = ThreadPoolExecutor(io_threads)
+        self.directories = set()
+        self.rendering = deque()
+        self.writing = deque()
+        self.saved = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def submit(self, problem, submission):
+        """Queue a problem for rendering and writing"""
+        filepath = problem_path(problem)
+        statement = self.question_cache.get_markdown(problem) if self.question_cache else None
+        future = self.renderers.submit(render_problem, problem, submission, statement)
+        self.rendering.append((problem, submission, filepath, future))
+        self.advance(block=len(self.rendering) + len(self.writing) >= self.max_in_flight)
+    
+    def advance(self, block=False):
+        """Move finished renders to the writers and record finished writes
+        
+        With block set, waits until at least one pending problem moves on.
+        """
+        if block:
+            heads = [stage[0][3] for stage in (self.rendering, self.writing) if stage]
+            wait(heads, return_when=FIRST_COMPLETED)
+        
+        while self.rendering and self.rendering[0][3].done():
+            problem, submission, filepath, future = self.rendering.popleft()
+            content, statement = future.result()
+            if self.question_cache:
+                self.question_cache.put_markdown(problem, statement)
+            
+            # One mkdir per difficulty/topic directory instead of one per file
+            if filepath.parent not in self.directories:
+                filepath.parent.mkdir(parents=True, exist_ok=True)
+                self.directories.add(filepath.parent)
+            
+            write = self.writers.submit(self.manifest.write, filepath, content, make_dirs=False)
+            self.writing.append((problem, submission, filepath, write))
+        
+        while self.writing and self.writing[0][3].done():
+            problem, submission, filepath, write = self.writing.popleft()
+            if write.result():
+                print(f"✅ Saved: {problem['title']}")
+            self.problem_index.record_problem(filepath, problem, submission)
+            self.saved += 1
+    
+    def flush(self):
+        """Wait until every submitted problem is written and indexed"""
+        while self.rendering or self.writing:
+            self.advance(block=True)
+    
+    def close(self):
+        """Flush and shut down both pools"""
+        try:
+            self.flush()
+        finally:
+            self.renderers.shutdown()
+            self.writers.shutdown()
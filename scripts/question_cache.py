@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Question Cache
+Persistent on-disk cache for LeetCode question metadata, keyed by titleSlug
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+from html_markdown import content_hash
+
+BASE_DIR = Path(__file__).parent.parent
+STATS_DIR = BASE_DIR / "stats"
+
+CACHE_FILE = STATS_DIR / "question_cache.jsonl"
+CACHE_TTL = 30 * 24 * 3600   # Seconds before a cached question is re-fetched
+CACHE_MAX_ENTRIES = 5000     # Oldest entries are evicted beyond this size
+
+
+class QuestionCache:
+    """Append-only JSONL store of question payloads
+
+    Each line is {"slug", "fetched_at", "question"}, plus "markdown" once the
+    statement has been converted ({"hash", "text"}, keyed by a hash of the
+    HTML so a changed statement is converted again); the last line for a slug
+    wins. The file is compacted when stale or superseded lines pile up.
+    """
+    
+    def __init__(self, path=CACHE_FILE, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.line_count = 0
+        self.hits = 0
+        self.misses = 0
+        self.statements_reused = 0
+        self.load()
+    
+    def load(self):
+        """Load cache entries from disk"""
+        if not self.path.exists():
+            return
+        
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Skip a torn trailing write
+                
+                self.line_count += 1
+                # Re-insert so dict order tracks recency for eviction
+                self.entries.pop(entry['slug'], None)
+                self.entries[entry['slug']] = entry
+        
+        self.evict()
+    
+    def is_fresh(self, entry):
+        """Check whether an entry is within the TTL"""
+        return self.ttl is None or time.time() - entry['fetched_at'] < self.ttl
+    
+    def get(self, title_slug, fields=()):
+        """Return the cached question for a slug if fresh and holding all fields, or None"""
+        with self.lock:
+            entry = self.entries.get(title_slug)
+            if entry and self.is_fresh(entry) and all(field in entry['question'] for field in fields):
+                self.hits += 1
+                return entry['question']
+            
+            self.misses += 1
+            return None
+    
+    def put(self, title_slug, question):
+        """Store a question and append it to the cache file"""
+        entry = {
+            'slug': title_slug,
+            'fetched_at': time.time(),
+            'question': question
+        }
+        
+        with self.lock:
+            previous = self.entries.pop(title_slug, None)
+            if previous and 'markdown' in previous:
+                # Still valid if the re-fetched statement is unchanged
+                entry['markdown'] = previous['markdown']
+            self.entries[title_slug] = entry
+            self.append(entry)
+            
+            if len(self.entries) > self.max_entries:
+                self.evict()
+    
+    def get_markdown(self, question):
+        """Markdown converted from this question's statement HTML, or None"""
+        if not question.get('content'):
+            return None
+        
+        with self.lock:
+            entry = self.entries.get(question['titleSlug'])
+            markdown = entry and entry.get('markdown')
+            if markdown and markdown['hash'] == content_hash(question['content']):
+                self.statements_reused += 1
+                return markdown['text']
+            return None
+    
+    def put_markdown(self, question, text):
+        """Store the Markdown converted from a cached question's statement"""
+        if not question.get('content'):
+            return
+        
+        digest = content_hash(question['content'])
+        with self.lock:
+            entry = self.entries.get(question['titleSlug'])
+            if not entry or (entry.get('markdown') or {}).get('hash') == digest:
+                return
+            entry['markdown'] = {'hash': digest, 'text': text}
+            self.append(entry)
+    
+    def append(self, entry):
+        """Append an entry to the cache file (caller holds the lock)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, separators=(',', ':')) + "\n")
+        self.line_count += 1
+    
+    def evict(self):
+        """Drop expired and excess entries, compacting the file if worthwhile"""
+        for slug in [s for s, e in self.entries.items() if not self.is_fresh(e)]:
+            del self.entries[slug]
+        
+        while len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+        
+        if self.line_count > 2 * len(self.entries) + 100:
+            self.compact()
+    
+    def compact(self):
+        """Rewrite the cache file with only the live entries"""
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry, separators=(',', ':')) + "\n")
+        tmp_path.replace(self.path)
+        self.line_count = len(self.entries)
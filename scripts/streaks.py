@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Streak Engine
+Shared streak calculations over active days, stored as sorted date ordinals
+"""
+
+import os
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime, time
+from zoneinfo import ZoneInfo
+
+from compact_calendar import active_dates
+
+# Calendar days are local to this timezone (default: system local)
+CALENDAR_TIMEZONE = os.environ.get("CALENDAR_TIMEZONE")
+CALENDAR_TZ = ZoneInfo(CALENDAR_TIMEZONE) if CALENDAR_TIMEZONE else None
+
+
+def to_ordinal(day):
+    """Convert a date, datetime or ISO date string to a day ordinal"""
+    if isinstance(day, int):
+        return day
+    if isinstance(day, str):
+        return date.fromisoformat(day[:10]).toordinal()
+    if isinstance(day, datetime):
+        return day.date().toordinal()
+    return day.toordinal()
+
+
+def local_time(timestamp=None):
+    """Datetime of a Unix timestamp (default: now) in CALENDAR_TIMEZONE"""
+    if timestamp is None:
+        return datetime.now(CALENDAR_TZ)
+    return datetime.fromtimestamp(int(timestamp), CALENDAR_TZ)
+
+
+def local_date(timestamp):
+    """Calendar date of a Unix timestamp in CALENDAR_TIMEZONE"""
+    return local_time(timestamp).date()
+
+
+def calendar_today():
+    """Today's date in CALENDAR_TIMEZONE"""
+    return local_time().date()
+
+
+def day_start(day):
+    """Unix timestamp of midnight at the start of a date in CALENDAR_TIMEZONE"""
+    return int(datetime.combine(day, time.min, tzinfo=CALENDAR_TZ).timestamp())
+
+
+class StreakEngine:
+    """Active days as a sorted list of ordinals
+
+    Streaks are computed in a single pass over the ordinals. Appending a day
+    after the last active day (the usual case for mark_today) updates the
+    trailing run and the longest streak in O(1).
+    """
+    
+    def __init__(self, days=()):
+        self.days = sorted({to_ordinal(day) for day in days})
+        self.recompute()
+    
+    @classmethod
+    def from_calendar(cls, calendar_data):
+        """Build from calendar.json style data keyed by ISO date (bitsets only for a CalendarView)"""
+        return cls(day.toordinal() for day in active_dates(calendar_data))
+    
+    def __len__(self):
+        return len(self.days)
+    
+    def __contains__(self, day):
+        ordinal = to_ordinal(day)
+        i = bisect_left(self.days, ordinal)
+        return i < len(self.days) and self.days[i] == ordinal
+    
+    def recompute(self):
+        """Single pass to find the trailing run and the longest run"""
+        self.trailing_run = 0
+        self.longest_run = 0
+        previous = None
+        
+        for ordinal in self.days:
+            if previous is not None and ordinal == previous + 1:
+                self.trailing_run += 1
+            else:
+                self.trailing_run = 1
+            self.longest_run = max(self.longest_run, self.trailing_run)
+            previous = ordinal
+    
+    def add(self, day):
+        """Mark a day as active"""
+        ordinal = to_ordinal(day)
+        
+        if not self.days or ordinal > self.days[-1]:
+            if self.days and ordinal == self.days[-1] + 1:
+                self.trailing_run += 1
+            else:
+                self.trailing_run = 1
+            self.days.append(ordinal)
+            self.longest_run = max(self.longest_run, self.trailing_run)
+        elif ordinal not in self:
+            insort(self.days, ordinal)
+            self.recompute()
+    
+    def current(self, today=None):
+        """Consecutive active days ending today, or yesterday while today has no activity yet
+        
+        A streak only breaks once a whole day passes without activity, so a
+        run ending yesterday still counts (0 if neither day is active).
+        """
+        today = to_ordinal(today or calendar_today())
+        if not self.days or self.days[-1] not in (today, today - 1):
+            return 0
+        return self.trailing_run
+    
+    def longest(self):
+        """Longest run of consecutive active days"""
+        return self.longest_run
+    
+    def longest_between(self, start, end):
+        """Longest run of consecutive active days within [start, end]"""
+        lo = bisect_left(self.days, to_ordinal(start))
+        hi = bisect_right(self.days, to_ordinal(end))
+        
+        longest = run = 0
+        previous = None
+        for ordinal in self.days[lo:hi]:
+            run = run + 1 if previous is not None and ordinal == previous + 1 else 1
+            longest = max(longest, run)
+            previous = ordinal
+        return longest
+    
+    def active_between(self, start, end):
+        """Number of active days within [start, end]"""
+        return bisect_right(self.days, to_ordinal(end)) - bisect_left(self.days, to_ordinal(start))
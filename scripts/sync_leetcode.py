@@ -6,59 +6,145 @@ Automatically syncs your LeetCode submissions to GitHub
 
 import os
 import json
-import requests
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import time
 
+from calendar_log import apply_event, load_calendar_data
+from content_manifest import ContentManifest
+from generate_calendar import CalendarGenerator
+from graphql_replay import adapter_from_env
+from leetcode_client import POOL_SIZE, LeetCodeClient
+from problem_index import ProblemIndex
+from problem_writer import ProblemWriter, problem_path, problem_statement, render_problem_markdown
+from question_cache import QuestionCache
+from streaks import CALENDAR_TZ, StreakEngine, calendar_today, local_time
+
 # Configuration
 LEETCODE_USERNAME = "aptikpandey9"
-LEETCODE_API = "https://leetcode.com/graphql"
+LEETCODE_API = os.environ.get("LEETCODE_API", "https://leetcode.com/graphql")
 GITHUB_REPO = "Aptik09/leetcode-journey"
 
+# Concurrency and rate limiting
+MAX_WORKERS = 4           # Parallel problem-detail fetches
+REQUESTS_PER_SECOND = 2   # Sustained request rate towards LeetCode
+BURST_SIZE = 4            # Requests allowed back-to-back before throttling
+DETAIL_BATCH_SIZE = 10    # Questions fetched per GraphQL request
+
+# Question fields and their sub-selections
+QUESTION_FIELDS = {
+    "questionId": "",
+    "title": "",
+    "titleSlug": "",
+    "content": "",
+    "difficulty": "",
+    "topicTags": "{ name slug }",
+    "codeSnippets": "{ lang code }",
+    "stats": "",
+}
+
+# Query profiles: minimal is enough for the index and README, standard adds the
+# statement used in problem files, full adds every language's starter code and
+# the submission stats
+QUESTION_PROFILES = {
+    "minimal": ["questionId", "title", "titleSlug", "difficulty", "topicTags"],
+    "standard": ["questionId", "title", "titleSlug", "content", "difficulty", "topicTags"],
+    "full": list(QUESTION_FIELDS),
+}
+QUERY_PROFILE = os.environ.get("LEETCODE_QUERY_PROFILE", "standard")
+
 # Directories
 BASE_DIR = Path(__file__).parent.parent
 PROBLEMS_DIR = BASE_DIR / "problems"
 STATS_DIR = BASE_DIR / "stats"
 CONTESTS_DIR = BASE_DIR / "contests"
+SYNC_STATE_FILE = STATS_DIR / "sync_state.json"
+STATS_FILE = STATS_DIR / "progress.json"
+BACKFILL_STATE_FILE = STATS_DIR / "backfill_state.json"
+
+# Backfill (full submission history needs an authenticated session)
+BACKFILL_PAGE_SIZE = 20
+LEETCODE_SESSION = os.environ.get("LEETCODE_SESSION")
+LEETCODE_CSRF_TOKEN = os.environ.get("LEETCODE_CSRF_TOKEN")
 
 # Create directories
 for dir_path in [PROBLEMS_DIR, STATS_DIR, CONTESTS_DIR]:
     dir_path.mkdir(exist_ok=True)
 
-# Topic mapping
-TOPIC_MAPPING = {
-    "array": "Array",
-    "string": "String",
-    "hash-table": "Hash Table",
-    "dynamic-programming": "Dynamic Programming",
-    "math": "Math",
-    "sorting": "Sorting",
-    "greedy": "Greedy",
-    "depth-first-search": "DFS",
-    "breadth-first-search": "BFS",
-    "binary-search": "Binary Search",
-    "tree": "Tree",
-    "matrix": "Matrix",
-    "bit-manipulation": "Bit Manipulation",
-    "two-pointers": "Two Pointers",
-    "binary-tree": "Binary Tree",
-    "heap": "Heap",
-    "stack": "Stack",
-    "graph": "Graph",
-    "linked-list": "Linked List",
-    "backtracking": "Backtracking",
-}
+
+class RateLimiter:
+    """Thread-safe token bucket limiting requests per second"""
+    
+    def __init__(self, rate=REQUESTS_PER_SECOND, burst=BURST_SIZE):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                wait = (1 - self.tokens) / self.rate
+            
+            time.sleep(wait)
 
 
 class LeetCodeSync:
-    def __init__(self):
+    def __init__(self, max_workers=MAX_WORKERS, rate=REQUESTS_PER_SECOND, burst=BURST_SIZE,
+                 batch_size=DETAIL_BATCH_SIZE, record_calendar=True, profile=QUERY_PROFILE):
         self.username = LEETCODE_USERNAME
-        self.session = requests.Session()
+        if profile not in QUESTION_PROFILES:
+            raise ValueError(f"Unknown query profile '{profile}', use one of: {', '.join(QUESTION_PROFILES)}")
+        self.required_fields = QUESTION_PROFILES[profile]
+        self.question_fields = " ".join(
+            f"{field} {QUESTION_FIELDS[field]}".strip() for field in self.required_fields
+        )
+        self.record_calendar = record_calendar
+        self.calendar_events = []
+        self.max_workers = max(1, max_workers)
+        self.batch_size = max(1, batch_size)
+        self.rate_limiter = RateLimiter(rate, burst)
+        self.question_cache = QuestionCache()
+        self.manifest = ContentManifest()
+        self.problem_index = ProblemIndex()
+        pool_size = max(POOL_SIZE, self.max_workers)
+        self.client = LeetCodeClient(
+            LEETCODE_API,
+            rate_limiter=self.rate_limiter,
+            pool_size=pool_size,
+            adapter=adapter_from_env(pool_size)
+        )
+        self.session = self.client.session
         self.session.headers.update({
             'Content-Type': 'application/json',
             'User-Agent': 'Mozilla/5.0'
         })
+        
+        if LEETCODE_SESSION:
+            self.session.cookies.set('LEETCODE_SESSION', LEETCODE_SESSION)
+        if LEETCODE_CSRF_TOKEN:
+            self.session.cookies.set('csrftoken', LEETCODE_CSRF_TOKEN)
+            self.session.headers.update({
+                'x-csrftoken': LEETCODE_CSRF_TOKEN,
+                'Referer': 'https://leetcode.com'
+            })
+    
+    def post(self, query, variables):
+        """Send a rate-limited GraphQL request, retrying transient failures"""
+        return self.client.post({"query": query, "variables": variables})
     
     def get_user_profile(self):
         """Fetch user profile data"""
@@ -81,12 +167,9 @@ class LeetCodeSync:
         """
         
         variables = {"username": self.username}
-        response = self.session.post(
-            LEETCODE_API,
-            json={"query": query, "variables": variables}
-        )
+        response = self.post(query, variables)
         
-        if response.status_code == 200:
+        if response is not None and response.status_code == 200:
             return response.json()
         return None
     
@@ -106,139 +189,198 @@ class LeetCodeSync:
         """
         
         variables = {"username": self.username, "limit": limit}
-        response = self.session.post(
-            LEETCODE_API,
-            json={"query": query, "variables": variables}
-        )
+        response = self.post(query, variables)
         
-        if response.status_code == 200:
+        if response is not None and response.status_code == 200:
             return response.json()
         return None
     
-    def get_problem_details(self, title_slug):
-        """Fetch problem details"""
+    def get_submission_page(self, offset, limit=BACKFILL_PAGE_SIZE, last_key=None):
+        """Fetch one page of the full submission history (requires login)"""
         query = """
-        query getQuestionDetail($titleSlug: String!) {
-            question(titleSlug: $titleSlug) {
-                questionId
-                title
-                titleSlug
-                content
-                difficulty
-                topicTags {
-                    name
-                    slug
-                }
-                codeSnippets {
+        query submissionList($offset: Int!, $limit: Int!, $lastKey: String) {
+            submissionList(offset: $offset, limit: $limit, lastKey: $lastKey) {
+                lastKey
+                hasNext
+                submissions {
+                    id
+                    title
+                    titleSlug
+                    timestamp
+                    statusDisplay
                     lang
-                    code
                 }
-                stats
             }
         }
         """
         
-        variables = {"titleSlug": title_slug}
-        response = self.session.post(
-            LEETCODE_API,
-            json={"query": query, "variables": variables}
-        )
+        variables = {"offset": offset, "limit": limit, "lastKey": last_key}
+        response = self.post(query, variables)
         
-        if response.status_code == 200:
+        if response is not None and response.status_code == 200:
             return response.json()
         return None
     
-    def save_problem(self, problem_data, submission_data):
-        """Save problem to appropriate directory"""
-        difficulty = problem_data['difficulty'].lower()
-        topics = [tag['slug'] for tag in problem_data['topicTags']]
-        primary_topic = topics[0] if topics else 'miscellaneous'
+    def get_problem_details(self, title_slug):
+        """Fetch problem details, served from the local cache when possible"""
+        cached = self.question_cache.get(title_slug, self.required_fields)
+        if cached:
+            return {'data': {'question': cached}}
+        return self.fetch_question(title_slug)
+    
+    def fetch_question(self, title_slug):
+        """Fetch one problem's details from LeetCode, bypassing the cache lookup"""
+        query = """
+        query getQuestionDetail($titleSlug: String!) {
+            question(titleSlug: $titleSlug) {%s}
+        }
+        """ % self.question_fields
+        
+        variables = {"titleSlug": title_slug}
+        response = self.post(query, variables)
+        
+        if response is not None and response.status_code == 200:
+            result = response.json()
+            question = (result.get('data') or {}).get('question')
+            if question:
+                self.question_cache.put(title_slug, question)
+            return result
+        return None
+    
+    def get_problem_details_batch(self, title_slugs):
+        """Fetch several problems in one request using aliased question fields
+        
+        Returns {title_slug: question or None}. Slugs the server cannot resolve
+        map to None without failing the rest of the batch; if the server rejects
+        the batch outright, each slug is fetched with a single query instead.
+        """
+        # Callers already missed the cache for these slugs, so go straight to the network
+        if len(title_slugs) == 1:
+            result = self.fetch_question(title_slugs[0])
+            return {title_slugs[0]: result and (result.get('data') or {}).get('question')}
+        
+        params = ", ".join(f"$s{i}: String!" for i in range(len(title_slugs)))
+        fields = "\n".join(
+            f"q{i}: question(titleSlug: $s{i}) {{{self.question_fields}}}"
+            for i in range(len(title_slugs))
+        )
+        query = f"query getQuestionDetails({params}) {{\n{fields}\n}}"
+        
+        variables = {f"s{i}": slug for i, slug in enumerate(title_slugs)}
+        response = self.post(query, variables)
+        
+        data = response.json().get('data') if response is not None and response.status_code == 200 else None
+        if not data:
+            # Oversized or otherwise rejected batch: fall back to single queries
+            print(f"⚠️  Batch of {len(title_slugs)} rejected, falling back to single queries")
+            results = {}
+            for slug in title_slugs:
+                result = self.fetch_question(slug)
+                results[slug] = result and (result.get('data') or {}).get('question')
+            return results
+        
+        results = {}
+        for i, slug in enumerate(title_slugs):
+            question = data.get(f"q{i}")
+            if question:
+                self.question_cache.put(slug, question)
+            results[slug] = question
+        return results
+    
+    def fetch_problem_details(self, submission_list):
+        """Fetch details for each submission using a bounded worker pool
+        
+        Cached problems are served locally; the rest are fetched in batches of
+        batch_size. Yields (submission, problem_data) pairs in the original
+        submission order as soon as each one is available.
+        """
+        results = {}
+        pending = []
+        for submission in submission_list:
+            slug = submission['titleSlug']
+            if slug in results or slug in pending:
+                continue
+            cached = self.question_cache.get(slug, self.required_fields)
+            if cached:
+                results[slug] = cached
+            else:
+                pending.append(slug)
         
-        # Create directory structure
-        problem_dir = PROBLEMS_DIR / difficulty / primary_topic
-        problem_dir.mkdir(parents=True, exist_ok=True)
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
         
-        # Create problem file
-        problem_id = problem_data['questionId']
-        title_slug = problem_data['titleSlug']
-        filename = f"{problem_id}_{title_slug}.md"
-        filepath = problem_dir / filename
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            batch_results = executor.map(self.get_problem_details_batch, batches)
+            
+            for submission in submission_list:
+                slug = submission['titleSlug']
+                while slug not in results:
+                    results.update(next(batch_results))
+                
+                question = results[slug]
+                yield submission, {'data': {'question': question}} if question else None
+    
+    def save_problem(self, problem_data, submission_data):
+        """Save problem to appropriate directory"""
+        filepath = problem_path(problem_data, PROBLEMS_DIR)
         
         # Generate markdown content
         content = self.generate_problem_markdown(problem_data, submission_data)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # Only touch the file when the rendered markdown differs
+        if self.manifest.write(filepath, content):
+            print(f"✅ Saved: {problem_data['title']}")
         
-        print(f"✅ Saved: {problem_data['title']}")
+        self.problem_index.record_problem(filepath, problem_data, submission_data)
         return filepath
     
     def generate_problem_markdown(self, problem, submission):
-        """Generate markdown for problem"""
-        topics_str = ", ".join([tag['name'] for tag in problem['topicTags']])
-        
-        markdown = f"""# {problem['questionId']}. {problem['title']}
-
-**Difficulty:** {problem['difficulty']}  
-**Topics:** {topics_str}  
-**Link:** [LeetCode](https://leetcode.com/problems/{problem['titleSlug']}/)  
-**Solved:** {datetime.fromtimestamp(int(submission['timestamp'])).strftime('%Y-%m-%d %H:%M:%S')}
-
----
-
-## Problem Statement
-
-{problem['content']}
-
----
-
-## Solution
-
-```{submission['lang']}
-// Solution will be added here
-// Language: {submission['lang']}
-```
-
----
-
-## Complexity Analysis
-
-- **Time Complexity:** O(?)
-- **Space Complexity:** O(?)
-
----
-
-## Notes
-
-Add your notes here...
-
----
-
-## Related Problems
-
-- Problem 1
-- Problem 2
-
-"""
-        return markdown
+        """Generate markdown for problem, reusing a statement converted on an earlier run"""
+        statement = self.question_cache.get_markdown(problem)
+        if statement is None:
+            statement = problem_statement(problem)
+            self.question_cache.put_markdown(problem, statement)
+        return render_problem_markdown(problem, submission, statement)
     
-    def update_stats(self):
-        """Update statistics file"""
-        profile = self.get_user_profile()
-        if not profile:
-            return
-        
-        stats = {
-            "last_updated": datetime.now().isoformat(),
+    def load_stats(self):
+        """Load progress.json, or zeroed stats if it does not exist"""
+        if STATS_FILE.exists():
+            with open(STATS_FILE, 'r') as f:
+                return json.load(f)
+        return {
+            "last_updated": None,
             "username": self.username,
             "total_solved": 0,
             "easy_solved": 0,
             "medium_solved": 0,
             "hard_solved": 0,
-            "ranking": profile['data']['matchedUser']['profile']['ranking']
+            "ranking": 0
         }
+    
+    def needs_reconcile(self, stats):
+        """Whether the profile must be fetched: never fetched, not yet today, or local counts drifted"""
+        reconciled_at = stats.get('reconciled_at')
+        if not reconciled_at:
+            return "first reconciliation"
+        
+        # By calendar date, not a 24h interval: the daily cron drifts by minutes either way
+        if datetime.fromisoformat(reconciled_at).astimezone(CALENDAR_TZ).date() < calendar_today():
+            return "daily reconciliation"
         
-        for item in profile['data']['matchedUser']['submitStats']['acSubmissionNum']:
+        # Every indexed problem is solved, so the stats can never be lower
+        for difficulty, count in self.problem_index.difficulty_counts().items():
+            if stats.get(f"{difficulty}_solved", 0) < count:
+                return f"{difficulty} count drifted"
+        return None
+    
+    def reconcile_stats(self, stats):
+        """Overwrite counts and ranking from the LeetCode profile; returns False on failure"""
+        profile = self.get_user_profile()
+        user = profile and (profile.get('data') or {}).get('matchedUser')
+        if not user:
+            return False
+        
+        stats['ranking'] = user['profile']['ranking']
+        for item in user['submitStats']['acSubmissionNum']:
             difficulty = item['difficulty']
             count = item['count']
             
@@ -251,16 +393,104 @@ Add your notes here...
             elif difficulty == "Hard":
                 stats['hard_solved'] = count
         
-        # Save stats
-        stats_file = STATS_DIR / "progress.json"
-        with open(stats_file, 'w') as f:
-            json.dump(stats, f, indent=2)
+        stats['reconciled_at'] = local_time().isoformat()
+        return True
+    
+    def calendar_streaks(self):
+        """Current and longest streak, including days synced but not yet merged into the calendar"""
+        calendar_data = load_calendar_data()
+        for event in self.calendar_events:
+            apply_event(calendar_data, event)  # Idempotent for already-recorded submissions
+        engine = StreakEngine.from_calendar(calendar_data)
+        return engine.current(), engine.longest()
+    
+    def update_stats(self, reconcile=False):
+        """Update progress.json incrementally
+        
+        Counts grow by the problems indexed for the first time in this run;
+        the profile query only runs when reconcile is set, on the first run of
+        each calendar day, or when the local index shows more problems than the
+        stats. Streaks are taken from the calendar.
+        """
+        previous = self.load_stats()
+        stats = dict(previous)
+        stats['username'] = self.username
+        
+        # The index already holds this run's problems, so check drift against the grown counts
+        local = dict(stats)
+        new_problems = self.problem_index.new_problems
+        for difficulty in ["easy", "medium", "hard"]:
+            local[f"{difficulty}_solved"] = local.get(f"{difficulty}_solved", 0) + new_problems[difficulty]
+        local['total_solved'] = local.get('total_solved', 0) + sum(new_problems.values())
+        
+        reason = "requested" if reconcile else self.needs_reconcile(local)
+        if reason and self.reconcile_stats(stats):
+            print(f"🔁 Stats reconciled with LeetCode profile ({reason})")
+        else:
+            if reason:
+                print("⚠️  Profile unavailable, updating stats locally")
+            stats = local
+        
+        stats['streak'], stats['longest_streak'] = self.calendar_streaks()
+        
+        # Only touch last_updated (and the file) when something else changed
+        if {**previous, "last_updated": None} != {**stats, "last_updated": None}:
+            stats['last_updated'] = datetime.now().isoformat()
+            self.manifest.write(STATS_FILE, json.dumps(stats, indent=2))
+            self.manifest.save()
         
         print(f"📊 Stats updated: {stats['total_solved']} problems solved")
         return stats
     
-    def sync(self):
-        """Main sync function"""
+    def load_sync_state(self):
+        """Load the high-water mark of the last synced submission"""
+        if SYNC_STATE_FILE.exists():
+            with open(SYNC_STATE_FILE, 'r') as f:
+                return json.load(f)
+        return {"last_timestamp": 0, "last_id": 0}
+    
+    def save_sync_state(self, state):
+        """Persist the high-water mark"""
+        with open(SYNC_STATE_FILE, 'w') as f:
+            json.dump(state, f, indent=2)
+    
+    @staticmethod
+    def submission_key(submission):
+        """Ordering key for submissions: (timestamp, id)"""
+        return (int(submission['timestamp']), int(submission['id']))
+    
+    def submission_marks(self, submissions):
+        """Aggregate accepted submissions into one calendar event per local date"""
+        by_date = defaultdict(list)
+        for submission in submissions:
+            solved = local_time(submission['timestamp'])
+            by_date[solved.date().isoformat()].append((solved, submission['id']))
+        
+        return [
+            {
+                'date': day,
+                'count': len(entries),
+                'timestamp': max(entries)[0].isoformat(),
+                'submissions': sorted(submission_id for _, submission_id in entries)
+            }
+            for day, entries in sorted(by_date.items())
+        ]
+    
+    def mark_calendar(self, submissions):
+        """Merge solve days from submissions into the calendar in one bulk write"""
+        events = self.submission_marks(submissions)
+        self.calendar_events.extend(events)
+        
+        if self.record_calendar and events:
+            CalendarGenerator().record_events(events)
+    
+    def sync(self, full=False):
+        """Main sync function
+        
+        Only submissions newer than the stored cursor are processed unless
+        full is set. Returns the updated stats, or None if the submissions
+        could not be fetched.
+        """
         print("🔄 Starting LeetCode sync...")
         
         # Get recent submissions
@@ -272,33 +502,231 @@ Add your notes here...
         submission_list = submissions['data']['recentAcSubmissionList']
         print(f"📥 Found {len(submission_list)} recent submissions")
         
-        # Process each submission
-        for submission in submission_list:
-            title_slug = submission['titleSlug']
+        state = self.load_sync_state()
+        if not full:
+            cursor = (state['last_timestamp'], state['last_id'])
+            submission_list = [s for s in submission_list if self.submission_key(s) > cursor]
             
-            # Get problem details
-            problem_data = self.get_problem_details(title_slug)
-            if not problem_data:
-                continue
+            if not submission_list:
+                print("✨ Nothing new since last sync")
+                # Streaks still move and the daily reconciliation is still due on quiet days
+                return self.update_stats()
             
-            problem = problem_data['data']['question']
+            print(f"🆕 {len(submission_list)} new since last sync")
+        
+        # Fetch problem details concurrently, save in submission order
+        failed = []
+        saved = []
+        for submission, problem_data in self.fetch_problem_details(submission_list):
+            problem = problem_data and (problem_data.get('data') or {}).get('question')
+            if not problem:
+                failed.append(submission)
+                continue
             
             # Save problem
             self.save_problem(problem, submission)
-            
-            # Rate limiting
-            time.sleep(1)
+            saved.append(submission)
+        
+        self.mark_calendar(saved)
+        
+        cache = self.question_cache
+        print(f"🗃️  Question cache: {cache.hits} hit(s), {cache.misses} miss(es), "
+              f"{cache.statements_reused} statement(s) already converted")
+        print(f"📝 Problem files: {self.manifest.summary()}")
+        self.manifest.save()
+        self.problem_index.save()
+        
+        # Advance the cursor, but never past a submission that failed so it is retried
+        synced = [s for s in submission_list if s not in failed]
+        if failed:
+            oldest_failure = min(self.submission_key(s) for s in failed)
+            synced = [s for s in synced if self.submission_key(s) < oldest_failure]
+            print(f"⚠️  {len(failed)} submission(s) failed and will be retried next run")
+        
+        if synced:
+            newest = max(synced, key=self.submission_key)
+            last_timestamp, last_id = self.submission_key(newest)
+            if (last_timestamp, last_id) > (state['last_timestamp'], state['last_id']):
+                self.save_sync_state({"last_timestamp": last_timestamp, "last_id": last_id})
         
         # Update stats
-        self.update_stats()
+        stats = self.update_stats()
         
+        print(f"🌐 HTTP: {self.client.summary()}")
         print("✅ Sync completed!")
-
+        return stats
+    
+    def load_backfill_state(self):
+        """Load the backfill checkpoint"""
+        if BACKFILL_STATE_FILE.exists():
+            with open(BACKFILL_STATE_FILE, 'r') as f:
+                return {"failed": {}, "complete": False, **json.load(f)}
+        return self.new_backfill_state()
+    
+    @staticmethod
+    def new_backfill_state():
+        """Checkpoint for a backfill starting from the newest submission"""
+        return {"offset": 0, "last_key": None, "seen": [], "newest": None, "saved": 0,
+                "failed": {}, "complete": False}
+    
+    def save_backfill_state(self, state):
+        """Persist the backfill checkpoint atomically"""
+        tmp_file = BACKFILL_STATE_FILE.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(state, f)
+        tmp_file.replace(BACKFILL_STATE_FILE)
+    
+    def save_backfill_problems(self, writer, submission_list, failed):
+        """Submit each problem to the writer; returns the saved submissions
+        
+        Submissions whose details could not be fetched are added to failed
+        (title slug -> accepted submissions, newest first) instead.
+        """
+        saved = []
+        for submission, problem_data in self.fetch_problem_details(submission_list):
+            problem = problem_data and (problem_data.get('data') or {}).get('question')
+            if problem:
+                writer.submit(problem, submission)
+                saved.append(submission)
+            else:
+                failed.setdefault(submission['titleSlug'], []).append(submission)
+        return saved
+    
+    def backfill(self, page_size=BACKFILL_PAGE_SIZE, restart=False):
+        """Import the full accepted-submission history page by page
+        
+        Each page is fetched, saved to disk and checkpointed before the next
+        one is requested, so memory stays bounded by the page size and an
+        interrupted run resumes where it stopped. Problems whose details could
+        not be fetched are kept in the checkpoint and retried at the end; if
+        any still fail, the checkpoint is kept so the next run retries them.
+        """
+        print("🔄 Starting LeetCode backfill...")
+        
+        state = self.load_backfill_state()
+        if restart:
+            state = self.new_backfill_state()
+        elif state['complete']:
+            print(f"⏩ History already imported, retrying {len(state['failed'])} failed problem(s)")
+        elif state['offset']:
+            print(f"⏩ Resuming from offset {state['offset']} ({state['saved']} saved so far)")
+        
+        seen = set(state['seen'])  # Failed slugs stay seen so older submissions do not replace them
+        failed = state['failed']
+        saved_before = state['saved']
+        
+        with ProblemWriter(self.manifest, self.problem_index, self.question_cache) as writer:
+            while not state['complete']:
+                page = self.get_submission_page(state['offset'], page_size, state['last_key'])
+                page = page and (page.get('data') or {}).get('submissionList')
+                if not page:
+                    print("❌ Failed to fetch submission history (is LEETCODE_SESSION set?)")
+                    return
+                
+                accepted = [s for s in page['submissions'] if s['statusDisplay'] == 'Accepted']
+                
+                # The newest accepted submission for each problem wins
+                submission_list = []
+                for submission in accepted:
+                    if submission['titleSlug'] in seen:
+                        continue
+                    seen.add(submission['titleSlug'])
+                    submission_list.append(submission)
+                
+                # Rendering and writing overlap with fetching the rest of the page
+                saved = self.save_backfill_problems(writer, submission_list, failed)
+                
+                # Older solves of a failed problem are marked once it is saved
+                for submission in accepted:
+                    if submission['titleSlug'] in failed and submission not in failed[submission['titleSlug']]:
+                        failed[submission['titleSlug']].append(submission)
+                self.mark_calendar([s for s in accepted if s['titleSlug'] not in failed])
+                
+                # Everything on the page must be on disk before it is checkpointed
+                writer.flush()
+                state['saved'] = saved_before + writer.saved
+                self.manifest.save()
+                self.problem_index.save()
+                for submission in page['submissions']:
+                    key = list(self.submission_key(submission))
+                    if state['newest'] is None or key > state['newest']:
+                        state['newest'] = key
+                
+                state['offset'] += len(page['submissions'])
+                state['last_key'] = page.get('lastKey')
+                state['seen'] = sorted(seen)
+                state['complete'] = not page.get('hasNext') or not page['submissions']
+                self.save_backfill_state(state)
+                print(f"📄 Offset {state['offset']}: {len(saved)} of {len(submission_list)} "
+                      f"problem(s) saved ({state['saved']} total)")
+            
+            if failed:
+                print(f"🔁 Retrying {len(failed)} problem(s) whose details could not be fetched")
+                retried = [submissions[0] for submissions in failed.values()]
+                recovered = self.save_backfill_problems(writer, retried, {})
+                writer.flush()
+                self.mark_calendar([
+                    solve for submission in recovered for solve in failed.pop(submission['titleSlug'])
+                ])
+                state['saved'] = saved_before + writer.saved
+                self.manifest.save()
+                self.problem_index.save()
+        
+        # Later incremental syncs only need to look past the newest backfilled submission,
+        # but never past a problem that is still missing
+        cursor = state['newest'] and tuple(state['newest'])
+        if failed:
+            oldest_timestamp, oldest_id = min(self.submission_key(s[0]) for s in failed.values())
+            cursor = min(cursor, (oldest_timestamp, oldest_id - 1))
+        if cursor:
+            sync_state = self.load_sync_state()
+            if cursor > (sync_state['last_timestamp'], sync_state['last_id']):
+                self.save_sync_state({"last_timestamp": cursor[0], "last_id": cursor[1]})
+        
+        if failed:
+            self.save_backfill_state(state)
+        else:
+            BACKFILL_STATE_FILE.unlink(missing_ok=True)
+        print(f"📝 Problem files: {self.manifest.summary()}")
+        
+        self.update_stats(reconcile=True)
+        print(f"🌐 HTTP: {self.client.summary()}")
+        
+        if failed:
+            titles = ", ".join(submissions[0]['title'] for submissions in failed.values())
+            print(f"⚠️  {len(failed)} problem(s) could not be fetched: {titles}")
+            print("⚠️  Run backfill again to retry them")
+        print(f"✅ Backfill completed! {state['saved']} problem(s) saved")
 
 def main():
     """Main entry point"""
+    import sys
+    
     syncer = LeetCodeSync()
-    syncer.sync()
+    
+    if len(sys.argv) > 1:
+        command = sys.argv[1]
+        
+        if command == "sync":
+            # Incremental sync of recent submissions
+            syncer.sync()
+        
+        elif command == "full":
+            # Reprocess recent submissions regardless of the cursor
+            syncer.sync(full=True)
+        
+        elif command == "backfill":
+            # Import the whole submission history
+            args = sys.argv[2:]
+            restart = "restart" in args
+            sizes = [int(arg) for arg in args if arg.isdigit()]
+            syncer.backfill(page_size=sizes[0] if sizes else BACKFILL_PAGE_SIZE, restart=restart)
+        
+        else:
+            print("Unknown command. Use: sync, full, or backfill [page_size] [restart]")
+    
+    else:
+        syncer.sync()
 
 
 if __name__ == "__main__":
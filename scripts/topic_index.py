@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Topic Index
+Inverted index from topic slug to the IDs of every problem tagged with it
+"""
+
+import json
+from pathlib import Path
+
+from content_manifest import write_json_entries
+
+BASE_DIR = Path(__file__).parent.parent
+STATS_DIR = BASE_DIR / "stats"
+
+TOPIC_INDEX_FILE = STATS_DIR / "topic_index.json"
+
+# Display names for common topics; other topics use LeetCode's tag name
+TOPIC_MAPPING = {
+    "array": "Array",
+    "string": "String",
+    "hash-table": "Hash Table",
+    "dynamic-programming": "Dynamic Programming",
+    "math": "Math",
+    "sorting": "Sorting",
+    "greedy": "Greedy",
+    "depth-first-search": "DFS",
+    "breadth-first-search": "BFS",
+    "binary-search": "Binary Search",
+    "tree": "Tree",
+    "matrix": "Matrix",
+    "bit-manipulation": "Bit Manipulation",
+    "two-pointers": "Two Pointers",
+    "binary-tree": "Binary Tree",
+    "heap": "Heap",
+    "stack": "Stack",
+    "graph": "Graph",
+    "linked-list": "Linked List",
+    "backtracking": "Backtracking",
+}
+
+
+def problem_sort_key(problem_id):
+    """Numeric order for question IDs, which are strings"""
+    return (0, int(problem_id)) if problem_id.isdigit() else (1, problem_id)
+
+
+class TopicIndex:
+    """Topic slug -> set of problem IDs, built from each problem's full topicTags
+
+    A problem is listed under every tag it carries, not just the first one
+    that decides its directory. Tag names seen at save time are kept for
+    topics TOPIC_MAPPING does not cover.
+    """
+    
+    def __init__(self, path=TOPIC_INDEX_FILE):
+        self.path = Path(path)
+        self.topics = {}
+        self.names = {}
+        self.dirty = False
+        self.load()
+    
+    def load(self):
+        """Load the index"""
+        if not self.path.exists():
+            return
+        
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.topics = {slug: set(entry['problems']) for slug, entry in data.items()}
+        self.names = {slug: entry['name'] for slug, entry in data.items() if entry.get('name')}
+    
+    def save(self):
+        """Save the index if it changed"""
+        if not self.dirty:
+            return
+        
+        data = {
+            slug: {'name': self.names.get(slug), 'problems': sorted(ids, key=problem_sort_key)}
+            for slug, ids in self.topics.items() if ids
+        }
+        write_json_entries(self.path, data)
+        self.dirty = False
+    
+    def add(self, problem_id, tags):
+        """Index a problem under each of its tags ({'slug', 'name'} dicts or slugs)
+
+        Tags the problem no longer carries are dropped.
+        """
+        slugs = set()
+        for tag in tags:
+            slug = tag['slug'] if isinstance(tag, dict) else tag
+            slugs.add(slug)
+            if isinstance(tag, dict) and tag.get('name') and self.names.get(slug) != tag['name']:
+                self.names[slug] = tag['name']
+                self.dirty = True
+            
+            members = self.topics.setdefault(slug, set())
+            if problem_id not in members:
+                members.add(problem_id)
+                self.dirty = True
+        
+        for slug, members in self.topics.items():
+            if slug not in slugs and problem_id in members:
+                members.discard(problem_id)
+                self.dirty = True
+    
+    def rebuild(self, records):
+        """Rebuild from problem index records"""
+        topics = {}
+        for record in records:
+            for slug in record.get('topics') or [record['topic']]:
+                topics.setdefault(slug, set()).add(record['id'])
+        
+        if topics != self.topics:
+            self.topics = topics
+            self.dirty = True
+    
+    def name(self, slug):
+        """Display name for a topic"""
+        return TOPIC_MAPPING.get(slug) or self.names.get(slug) or slug.replace('-', ' ').title()
+    
+    def problems(self, slug):
+        """IDs of problems tagged with a topic, in numeric order"""
+        return sorted(self.topics.get(slug, ()), key=problem_sort_key)
+    
+    def counts(self):
+        """Problems per topic, without touching any problem record"""
+        return {slug: len(ids) for slug, ids in sorted(self.topics.items()) if ids}
@@ -4,23 +4,39 @@ README Update Script
 Automatically updates README with latest stats and calendar
 """
 
+import calendar
+import hashlib
 import json
 import os
-from datetime import datetime, timedelta
 from pathlib import Path
-from collections import defaultdict
+
+from calendar_log import load_calendar_data
+from calendar_render import WEEK_HEADER, month_grid
+from content_manifest import ContentManifest
+from problem_index import ProblemIndex
+from problem_store import ProblemStore
+from streaks import StreakEngine, calendar_today, local_time
 
 BASE_DIR = Path(__file__).parent.parent
 STATS_DIR = BASE_DIR / "stats"
 PROBLEMS_DIR = BASE_DIR / "problems"
 README_PATH = BASE_DIR / "README.md"
+SECTION_CACHE_FILE = STATS_DIR / "readme_sections.json"
+SECTION_CACHE_VERSION = 2  # Bump when generate_topic_section output changes
 
 
 class ReadmeUpdater:
-    def __init__(self):
-        self.stats = self.load_stats()
-        self.problems = self.scan_problems()
-        self.calendar_data = self.load_calendar()
+    def __init__(self, stats=None, problem_index=None, calendar_data=None, manifest=None):
+        # State already held in memory (e.g. by the pipeline) is used instead of re-reading files
+        self.stats = stats or self.load_stats()
+        self.problem_index = self.load_problem_index(problem_index)
+        self.topic_index = self.problem_index.topics
+        self.records_by_id = {record['id']: record for record in self.problem_index.records.values()}
+        self.calendar_data = calendar_data if calendar_data is not None else self.load_calendar()
+        self.manifest = manifest or ContentManifest()
+        self.section_cache = self.load_section_cache()
+        self.sections_rendered = 0
+        self.sections_reused = 0
     
     def load_stats(self):
         """Load statistics"""
@@ -38,138 +54,113 @@ class ReadmeUpdater:
     
     def load_calendar(self):
         """Load calendar data"""
-        calendar_file = STATS_DIR / "calendar.json"
-        if calendar_file.exists():
-            with open(calendar_file, 'r') as f:
-                return json.load(f)
-        return {}
+        return load_calendar_data()
     
-    def scan_problems(self):
-        """Scan all solved problems"""
-        problems = {
-            "easy": defaultdict(list),
-            "medium": defaultdict(list),
-            "hard": defaultdict(list)
-        }
-        
-        for difficulty in ["easy", "medium", "hard"]:
-            diff_dir = PROBLEMS_DIR / difficulty
-            if not diff_dir.exists():
-                continue
-            
-            for topic_dir in diff_dir.iterdir():
-                if not topic_dir.is_dir():
-                    continue
-                
-                topic = topic_dir.name
-                for problem_file in topic_dir.glob("*.md"):
-                    problems[difficulty][topic].append(problem_file)
-        
-        return problems
+    def load_problem_index(self, index=None):
+        """Problem index (with its topic index), built from disk on the first run"""
+        index = index or ProblemIndex()
+        if not index.records and not index.path.exists():
+            index.reconcile()
+        index.save()  # No-op unless reconciled or the topic index was just seeded
+        return index
+    
+    def topic_problems(self, topic):
+        """Records of every problem tagged with a topic, via the topic index"""
+        return [self.records_by_id[i] for i in self.topic_index.problems(topic) if i in self.records_by_id]
+    
+    def problems_this_month(self):
+        """Problems solved since the first of the current month"""
+        with ProblemStore(problem_index=self.problem_index) as store:
+            return store.count(since=calendar_today().replace(day=1))
     
     def calculate_streak(self):
         """Calculate current streak"""
-        if not self.calendar_data:
-            return 0
-        
-        dates = sorted(self.calendar_data.keys(), reverse=True)
-        if not dates:
-            return 0
-        
-        today = datetime.now().date()
-        streak = 0
-        
-        for date_str in dates:
-            date = datetime.fromisoformat(date_str).date()
-            expected_date = today - timedelta(days=streak)
-            
-            if date == expected_date:
-                streak += 1
-            else:
-                break
-        
-        return streak
+        return StreakEngine.from_calendar(self.calendar_data).current()
     
     def generate_calendar(self, year, month):
         """Generate calendar for a specific month"""
-        import calendar
-        
-        cal = calendar.monthcalendar(year, month)
         month_name = calendar.month_name[month]
         
-        # Header
         calendar_str = f"### {month_name} {year}\n```\n"
-        calendar_str += "Sun Mon Tue Wed Thu Fri Sat\n"
-        
-        # Days
-        for week in cal:
-            week_str = ""
-            for day in week:
-                if day == 0:
-                    week_str += "    "
-                else:
-                    date_str = f"{year}-{month:02d}-{day:02d}"
-                    if date_str in self.calendar_data:
-                        week_str += f" ✅ "
-                    else:
-                        week_str += f"{day:3d} "
-            calendar_str += week_str + "\n"
-        
+        calendar_str += WEEK_HEADER
+        calendar_str += month_grid(self.calendar_data, year, month)
         calendar_str += "```\n"
         return calendar_str
     
     def generate_topic_section(self, topic, problems_list):
         """Generate topic section"""
         section = f"""<details>
-<summary>📚 <b>{topic.replace('-', ' ').title()}</b> ({len(problems_list)} problems)</summary>
+<summary>📚 <b>{self.topic_index.name(topic)}</b> ({len(problems_list)} problems)</summary>
 
 | # | Problem | Difficulty | Solution | Date |
 |---|---------|-----------|----------|------|
 """
         
-        for problem_file in sorted(problems_list):
-            # Parse problem file
-            with open(problem_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Extract info (simplified)
-            lines = content.split('\n')
-            title_line = lines[0].replace('#', '').strip()
+        for problem in sorted(problems_list, key=lambda record: record['path']):
+            number = problem['id']
+            title = problem['title']
             
-            # Extract problem number and title
-            parts = title_line.split('.', 1)
-            if len(parts) == 2:
-                number = parts[0].strip()
-                title = parts[1].strip()
-            else:
-                number = "?"
-                title = title_line
-            
-            # Get difficulty from file path
-            difficulty = problem_file.parent.parent.name.capitalize()
+            difficulty = problem['difficulty'].capitalize()
             difficulty_emoji = {
                 "Easy": "🟢",
                 "Medium": "🟡",
                 "Hard": "🔴"
             }.get(difficulty, "⚪")
             
-            # Get date (from file modification time)
-            date = datetime.fromtimestamp(problem_file.stat().st_mtime).strftime('%Y-%m-%d')
+            # Date the problem was solved, precomputed when it was indexed
+            date = problem.get('solved_date', '-')
             
             # Relative path for link
-            rel_path = problem_file.relative_to(BASE_DIR)
+            rel_path = problem['path']
             
             section += f"| {number} | [{title}]({rel_path}) | {difficulty_emoji} {difficulty} | [View]({rel_path}) | {date} |\n"
         
         section += "\n</details>\n\n"
         return section
     
+    def cached_topic_section(self, topic, problems_list):
+        """Return a topic section, re-rendering only when its problems changed"""
+        members = sorted(
+            [record['path'], record['id'], record['title'], record['difficulty'], record.get('solved_date')]
+            for record in problems_list
+        )
+        key = hashlib.sha256(
+            json.dumps([SECTION_CACHE_VERSION, self.topic_index.name(topic), members]).encode('utf-8')
+        ).hexdigest()
+        
+        cached = self.section_cache.get(topic)
+        if cached and cached['key'] == key:
+            self.sections_reused += 1
+            return cached['section']
+        
+        section = self.generate_topic_section(topic, problems_list)
+        self.section_cache[topic] = {'key': key, 'section': section}
+        self.sections_rendered += 1
+        return section
+    
+    def load_section_cache(self):
+        """Load cached topic sections"""
+        if SECTION_CACHE_FILE.exists():
+            with open(SECTION_CACHE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+    
+    def save_section_cache(self, topics):
+        """Save cached topic sections, dropping topics no longer rendered"""
+        cache = {topic: self.section_cache[topic] for topic in sorted(topics) if topic in self.section_cache}
+        with open(SECTION_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2, ensure_ascii=False)
+    
     def generate_readme(self):
         """Generate complete README"""
+        return "".join(self.render_readme())
+    
+    def render_readme(self):
+        """Yield the README in chunks"""
         streak = self.calculate_streak()
         total = self.stats['total_solved']
         
-        readme = f"""# 🚀 LeetCode Journey - Aptik Pandey
+        yield f"""# 🚀 LeetCode Journey - Aptik Pandey
 
 <div align="center">
 
@@ -187,7 +178,7 @@ class ReadmeUpdater:
 
 ### 🔥 Current Streak: **{streak} Days**
 ### 📈 Total Problems Solved: **{total}**
-### 🎯 This Month: **{len(self.calendar_data)} Problems**
+### 🎯 This Month: **{self.problems_this_month()} Problems**
 
 ---
 
@@ -196,10 +187,10 @@ class ReadmeUpdater:
 """
         
         # Add calendar for current month
-        now = datetime.now()
-        readme += self.generate_calendar(now.year, now.month)
+        today = calendar_today()
+        yield self.generate_calendar(today.year, today.month)
         
-        readme += """
+        yield """
 **Legend:** ✅ = Solved | 🔥 = Streak Day | 🏆 = Contest Day
 
 ---
@@ -215,28 +206,20 @@ class ReadmeUpdater:
         hard_pct = (self.stats['hard_solved'] / 753 * 100) if self.stats['hard_solved'] > 0 else 0
         total_pct = (total / 3318 * 100) if total > 0 else 0
         
-        readme += f"| 🟢 Easy | {self.stats['easy_solved']} | 826 | {easy_pct:.1f}% |\n"
-        readme += f"| 🟡 Medium | {self.stats['medium_solved']} | 1739 | {medium_pct:.1f}% |\n"
-        readme += f"| 🔴 Hard | {self.stats['hard_solved']} | 753 | {hard_pct:.1f}% |\n"
-        readme += f"| **Total** | **{total}** | **3318** | **{total_pct:.1f}%** |\n"
+        yield f"| 🟢 Easy | {self.stats['easy_solved']} | 826 | {easy_pct:.1f}% |\n"
+        yield f"| 🟡 Medium | {self.stats['medium_solved']} | 1739 | {medium_pct:.1f}% |\n"
+        yield f"| 🔴 Hard | {self.stats['hard_solved']} | 753 | {hard_pct:.1f}% |\n"
+        yield f"| **Total** | **{total}** | **3318** | **{total_pct:.1f}%** |\n"
         
-        readme += "\n---\n\n## 📚 Topics Mastered\n\n"
+        yield "\n---\n\n## 📚 Topics Mastered\n\n"
         
-        # Add topic sections
-        all_topics = set()
-        for difficulty in ["easy", "medium", "hard"]:
-            all_topics.update(self.problems[difficulty].keys())
+        # One section per topic, listing every problem tagged with it
+        for topic in self.topic_index.counts():
+            problems_list = self.topic_problems(topic)
+            if problems_list:
+                yield self.cached_topic_section(topic, problems_list)
         
-        for topic in sorted(all_topics):
-            # Combine problems from all difficulties
-            all_problems = []
-            for difficulty in ["easy", "medium", "hard"]:
-                all_problems.extend(self.problems[difficulty].get(topic, []))
-            
-            if all_problems:
-                readme += self.generate_topic_section(topic, all_problems)
-        
-        readme += """
+        yield """
 ---
 
 ## 🏆 Contest Performance
@@ -303,23 +286,26 @@ This repository automatically syncs with my LeetCode profile:
 
 **"The only way to do great work is to love what you do."** - Steve Jobs
 
-Made with ❤️ by Aptik Pandey | Last Updated: {datetime.now().strftime('%B %d, %Y')}
+Made with ❤️ by Aptik Pandey | Last Updated: {local_time().strftime('%B %d, %Y')}
 
 </div>
 """
-        
-        return readme
     
     def update(self):
         """Update README file"""
         print("📝 Updating README...")
         
-        readme_content = self.generate_readme()
+        written = self.manifest.write_stream(README_PATH, self.render_readme())
+        self.manifest.save()
         
-        with open(README_PATH, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
+        if self.sections_rendered:
+            self.save_section_cache(self.topic_index.counts())
+        print(f"📚 Topic sections: {self.sections_rendered} rendered, {self.sections_reused} reused")
         
-        print("✅ README updated successfully!")
+        if written:
+            print("✅ README updated successfully!")
+        else:
+            print("✨ README already up to date")
 
 
 def main():